@@ -24,3 +24,9 @@ async def insert_club_mapping(club_id: str, club_name: str):
         ON CONFLICT (club_id) DO NOTHING
     """, club_id, club_name)
     await conn.close()
+
+async def fetch_all_club_mappings() -> dict[str, str]:
+    conn = await get_connection()
+    rows = await conn.fetch("SELECT club_id, club_name FROM club_mapping")
+    await conn.close()
+    return {str(row['club_id']): row['club_name'] for row in rows if row['club_name']}
@@ -14,6 +14,11 @@ import asyncpg
 import logging
 from discord.utils import escape_markdown
 import math
+import functools
+import codecs
+import heapq
+import gzip
+import zlib
 
 load_dotenv()
 
@@ -45,11 +50,36 @@ EA_HEADERS = {
     "Sec-Fetch-Dest": "empty",
 }
 
-_client_ea = httpx.AsyncClient(
+def make_http_client(
+    *,
+    timeout: float,
+    headers: dict | None = None,
+    http2: bool = True,
+    max_connections: int = 20,
+    max_keepalive: int = 10,
+    keepalive_expiry: float = 60.0,
+) -> httpx.AsyncClient:
+    """
+    Long-lived pooled client. Keep one per upstream API for the whole process so
+    TCP/TLS handshakes are paid once and reused (HTTP/2 multiplexes on top).
+    """
+    return httpx.AsyncClient(
+        timeout=timeout,
+        headers=headers,
+        http2=http2,
+        follow_redirects=True,
+        limits=httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive,
+            keepalive_expiry=keepalive_expiry,
+        ),
+    )
+
+_client_ea = make_http_client(
     timeout=12,
     headers=EA_HEADERS,
-    http2=True,
-    follow_redirects=True,
+    max_connections=int(os.getenv("EA_MAX_CONNECTIONS", "10")),
+    max_keepalive=int(os.getenv("EA_MAX_KEEPALIVE", "5")),
 )
 
 # --- Twitch live announce config ---
@@ -134,36 +164,23 @@ async def get_team_id_for_club(club_id: str | int) -> str | None:
     """
     club_id = str(club_id)
 
-    # 1) overallStats
+    # 1) overallStats (shares the cached response with get_club_stats)
     try:
-        r = await _client_ea.get(
+        data = await _ea_get_json(
             "https://proclubs.ea.com/api/fc/clubs/overallStats",
-            params={"platform": PLATFORM, "clubIds": club_id},
-        )
-        if r.status_code == 200:
-            data = r.json() or []
-            if isinstance(data, list) and data:
-                tid = data[0].get("teamId")
-                if tid:
-                    return str(tid)
+            {"platform": PLATFORM, "clubIds": club_id},
+            retries=2,
+        ) or []
+        if isinstance(data, list) and data:
+            tid = data[0].get("teamId")
+            if tid:
+                return str(tid)
     except Exception as e:
         print(f"[crest] overallStats lookup failed: {e}")
 
     # 2) matches fallback (check newest first among common types)
     try:
-        match_types = ["leagueMatch", "playoffMatch", "friendlyMatch"]
-        newest = []
-        for mt in match_types:
-            mres = await _client_ea.get(
-                "https://proclubs.ea.com/api/fc/clubs/matches",
-                params={"matchType": mt, "platform": PLATFORM, "clubIds": club_id},
-            )
-            if mres.status_code == 404:
-                continue
-            mres.raise_for_status()
-            arr = mres.json() or []
-            newest.extend(arr)
-        newest.sort(key=lambda x: x.get("timestamp", 0), reverse=True)
+        newest = await get_club_match_history(club_id)
         for m in newest:
             clubs = m.get("clubs", {}) or {}
             mine = clubs.get(club_id) or {}
@@ -602,16 +619,119 @@ class PrintRecordButton(discord.ui.View):
 import random
 import urllib.parse
 import asyncio
+import time
+import bisect
+from collections import OrderedDict
+from db import fetch_all_club_mappings
+
+# --- EA request guard: global rate limit, circuit breaker, shared retry budget ---
+EA_RATE_PER_SEC = float(os.getenv("EA_RATE_PER_SEC", "4"))
+EA_RATE_BURST = float(os.getenv("EA_RATE_BURST", "8"))
+EA_BREAKER_THRESHOLD = int(os.getenv("EA_BREAKER_THRESHOLD", "5"))
+EA_BREAKER_COOLDOWN = float(os.getenv("EA_BREAKER_COOLDOWN", "60"))
+EA_RETRY_BUDGET = float(os.getenv("EA_RETRY_BUDGET", "10"))
+EA_RETRY_REFILL_PER_SEC = float(os.getenv("EA_RETRY_REFILL_PER_SEC", "0.2"))
+EA_ANTIBOT_STATUSES = (403, 429)
+
+_ea_rate_lock = asyncio.Lock()
+_ea_bucket = {"tokens": EA_RATE_BURST, "updated": time.monotonic()}
+_ea_retry_bucket = {"tokens": EA_RETRY_BUDGET, "updated": time.monotonic()}
+_ea_breaker = {"failures": 0, "open_until": 0.0, "probing": False}
+
+def _refill(bucket: dict, rate: float, cap: float):
+    now = time.monotonic()
+    bucket["tokens"] = min(cap, bucket["tokens"] + (now - bucket["updated"]) * rate)
+    bucket["updated"] = now
+
+async def _ea_take_token():
+    """Wait for a slot in the process-wide EA token bucket."""
+    async with _ea_rate_lock:
+        while True:
+            _refill(_ea_bucket, EA_RATE_PER_SEC, EA_RATE_BURST)
+            if _ea_bucket["tokens"] >= 1:
+                _ea_bucket["tokens"] -= 1
+                return
+            await asyncio.sleep((1 - _ea_bucket["tokens"]) / EA_RATE_PER_SEC)
+
+def _ea_take_retry() -> bool:
+    """Spend one retry from the shared budget; False means nobody should retry right now."""
+    _refill(_ea_retry_bucket, EA_RETRY_REFILL_PER_SEC, EA_RETRY_BUDGET)
+    if _ea_retry_bucket["tokens"] >= 1:
+        _ea_retry_bucket["tokens"] -= 1
+        return True
+    return False
+
+def ea_circuit_open() -> bool:
+    return time.monotonic() < _ea_breaker["open_until"]
+
+def _ea_breaker_allows() -> bool:
+    if _ea_breaker["open_until"] <= 0:
+        return True
+    if ea_circuit_open() or _ea_breaker["probing"]:
+        return False
+    # cooldown over: let exactly one request through as a probe
+    _ea_breaker["probing"] = True
+    return True
+
+def _ea_breaker_record(status: int | None):
+    if status in EA_ANTIBOT_STATUSES:
+        _ea_breaker["failures"] += 1
+        if _ea_breaker["probing"] or _ea_breaker["failures"] >= EA_BREAKER_THRESHOLD:
+            _ea_breaker["open_until"] = time.monotonic() + EA_BREAKER_COOLDOWN
+            print(f"[EA] circuit open for {EA_BREAKER_COOLDOWN:.0f}s after {_ea_breaker['failures']} anti-bot responses")
+    elif status is not None and status < 500:
+        if _ea_breaker["open_until"] > 0:
+            print("[EA] circuit closed")
+        _ea_breaker["failures"] = 0
+        _ea_breaker["open_until"] = 0.0
+    _ea_breaker["probing"] = False
+
+async def _ea_send(url: str, params: dict) -> httpx.Response | None:
+    """
+    Single guarded GET on the shared EA client.
+    Returns None without touching the network while the circuit is open.
+    """
+    if not _ea_breaker_allows():
+        return None
+    probe = _ea_breaker["probing"]
 
-async def _ea_get_json(url: str, params: dict, retries: int = 5) -> dict | list | None:
-    """GET JSON with retries + short body log on non-200."""
+    try:
+        await _ea_take_token()
+        r = await _client_ea.get(url, params=params)
+    except Exception:
+        _ea_breaker_record(None)
+        raise
+    except BaseException:
+        # cancelled mid-request: release the probe slot, or the breaker never closes
+        if probe:
+            _ea_breaker["probing"] = False
+        raise
+
+    _ea_breaker_record(r.status_code)
+    return r
+
+async def _ea_fetch_json(url: str, params: dict, retries: int = 5, not_found=None) -> dict | list | None:
+    """
+    GET JSON with retries + short body log on non-200.
+    A 404 is final (never retried) and returns `not_found`.
+    """
     for attempt in range(retries):
+        if attempt and not _ea_take_retry():
+            print(f"[EA] retry budget exhausted, giving up on {url}")
+            break
+
         try:
-            r = await _client_ea.get(url, params=params)
+            r = await _ea_send(url, params)
+            if r is None:
+                # circuit open: fail fast instead of queueing more requests against EA
+                return None
 
             if r.status_code == 200:
                 return r.json()
 
+            if r.status_code == 404:
+                return not_found
+
             print(f"[EA] {r.status_code} {url} try {attempt+1}/{retries} :: {r.text[:200]}")
 
             # For anti-bot / transient blocking, back off a bit more
@@ -626,24 +746,508 @@ async def _ea_get_json(url: str, params: dict, retries: int = 5) -> dict | list
 
     return None
 
+# --- EA response cache (TTL per endpoint + LRU cap, serves stale while refreshing) ---
+EA_API_PREFIX = "https://proclubs.ea.com/api/fc/"
+
+# seconds a response counts as fresh, per endpoint path; endpoints not listed are never cached
+EA_CACHE_TTLS = {
+    "clubs/matches": int(os.getenv("EA_TTL_MATCHES", "60")),
+    "clubs/overallStats": int(os.getenv("EA_TTL_OVERALL", "300")),
+    "allTimeLeaderboard": int(os.getenv("EA_TTL_LEADERBOARD", "900")),
+    "allTimeLeaderboard/club": int(os.getenv("EA_TTL_LEADERBOARD", "900")),
+    "allTimeLeaderboard/search": int(os.getenv("EA_TTL_SEARCH", "600")),
+    "members/stats": int(os.getenv("EA_TTL_MEMBERS", "300")),
+    "club/members": int(os.getenv("EA_TTL_MEMBERS", "300")),
+}
+# how long past its TTL an entry may still be served while a background refresh runs
+EA_CACHE_STALE_SECONDS = int(os.getenv("EA_CACHE_STALE_SECONDS", "600"))
+EA_CACHE_MAX_ENTRIES = int(os.getenv("EA_CACHE_MAX_ENTRIES", "512"))
+
+_ea_cache: "OrderedDict[tuple, tuple[float, dict | list]]" = OrderedDict()
+_ea_cache_refreshing: set[tuple] = set()
+_ea_cache_tasks: set[asyncio.Task] = set()
+_ea_cache_stats: dict[str, dict[str, int]] = {}
+
+def _ea_endpoint(url: str) -> str:
+    return url[len(EA_API_PREFIX):].strip("/") if url.startswith(EA_API_PREFIX) else url
+
+def _ea_cache_count(endpoint: str, what: str):
+    bucket = _ea_cache_stats.setdefault(endpoint, {"hits": 0, "stale": 0, "misses": 0})
+    bucket[what] += 1
+
+def _ea_cache_key(url: str, params: dict | None) -> tuple:
+    return (url, tuple(sorted((str(k), str(v)) for k, v in (params or {}).items())))
+
+def _ea_cache_put(key: tuple, data):
+    _ea_cache[key] = (time.monotonic(), data)
+    _ea_cache.move_to_end(key)
+    while len(_ea_cache) > EA_CACHE_MAX_ENTRIES:
+        _ea_cache.popitem(last=False)
+
+async def _ea_cache_refresh(key: tuple, url: str, params: dict, retries: int, not_found=None):
+    try:
+        data = await _ea_fetch_json(url, params, retries=retries, not_found=not_found)
+        if data is not None:
+            _ea_cache_put(key, data)
+    except Exception as e:
+        print(f"[EA] background refresh failed {url} :: {e}")
+    finally:
+        _ea_cache_refreshing.discard(key)
+
+def get_ea_cache_stats() -> dict:
+    """Hit/stale/miss counters per EA endpoint, plus current cache size and circuit state."""
+    return {
+        "size": len(_ea_cache),
+        "max_entries": EA_CACHE_MAX_ENTRIES,
+        "circuit_open": ea_circuit_open(),
+        "retry_budget": int(_ea_retry_bucket["tokens"]),
+        "endpoints": {k: dict(v) for k, v in _ea_cache_stats.items()},
+    }
+
+def ea_cache_age(url: str, params: dict) -> float | None:
+    """Seconds since this request was cached, or None if it isn't."""
+    entry = _ea_cache.get(_ea_cache_key(url, params))
+    return None if entry is None else time.monotonic() - entry[0]
+
+async def _ea_get_json(
+    url: str,
+    params: dict,
+    retries: int = 5,
+    use_cache: bool = True,
+    force_refresh: bool = False,
+    not_found=None,
+) -> dict | list | None:
+    """
+    Cached EA GET. Fresh entries are returned straight from memory; entries
+    that are stale (but within EA_CACHE_STALE_SECONDS) are returned as-is
+    while a background refresh runs. While the circuit breaker is open any
+    cached entry is served regardless of age. force_refresh skips the lookup
+    but still stores the result. Failed fetches (None) are never cached;
+    a 404 returns (and caches, unless None) `not_found`.
+    """
+    endpoint = _ea_endpoint(url)
+    ttl = EA_CACHE_TTLS.get(endpoint)
+    if not use_cache or ttl is None:
+        return await _ea_fetch_json(url, params, retries=retries, not_found=not_found)
+
+    key = _ea_cache_key(url, params)
+    entry = None if force_refresh else _ea_cache.get(key)
+
+    if entry is not None:
+        stored_at, data = entry
+        age = time.monotonic() - stored_at
+
+        if age <= ttl:
+            _ea_cache.move_to_end(key)
+            _ea_cache_count(endpoint, "hits")
+            return data
+
+        if age <= ttl + EA_CACHE_STALE_SECONDS:
+            _ea_cache.move_to_end(key)
+            _ea_cache_count(endpoint, "stale")
+            if key not in _ea_cache_refreshing:
+                _ea_cache_refreshing.add(key)
+                task = asyncio.create_task(_ea_cache_refresh(key, url, dict(params or {}), retries, not_found))
+                _ea_cache_tasks.add(task)
+                task.add_done_callback(_ea_cache_tasks.discard)
+            return data
+
+        if ea_circuit_open():
+            # EA is throttling us: any cached answer beats no answer
+            _ea_cache_count(endpoint, "stale")
+            return data
+
+    _ea_cache_count(endpoint, "misses")
+    data = await _ea_fetch_json(url, params, retries=retries, not_found=not_found)
+    if data is not None:
+        _ea_cache_put(key, data)
+    return data
+
+# --- Local club name index (club_mapping.json + Postgres club_mapping + past search results) ---
+CLUB_SEARCH_TTL = int(os.getenv("CLUB_SEARCH_TTL", "21600"))
+CLUB_SEARCH_CACHE_MAX = int(os.getenv("CLUB_SEARCH_CACHE_MAX", "1000"))
+CLUB_FUZZY_CUTOFF = int(os.getenv("CLUB_FUZZY_CUTOFF", "92"))
+
+_club_names: dict[str, str] = {}                 # clubId -> display name
+_club_rows: dict[str, dict] = {}                 # clubId -> last EA search row for that club
+_club_name_index: dict[str, list[str]] = {}      # normalized name -> clubIds
+_club_name_keys: list[str] = []                  # sorted normalized names (prefix lookups via bisect)
+_club_search_cache: "OrderedDict[str, tuple[float, list]]" = OrderedDict()  # normalized query -> EA results
+
+def remember_club_name(club_id: str | int, name: str | None, row: dict | None = None):
+    cid = str(club_id or "").strip()
+    name = (name or "").strip()
+    if not cid or not name or name.lower() == "none of these":
+        return
+
+    old = _club_names.get(cid)
+    if old and old != name:
+        old_key = normalize(old)
+        ids = _club_name_index.get(old_key, [])
+        if cid in ids:
+            ids.remove(cid)
+        if not ids:
+            _club_name_index.pop(old_key, None)
+            i = bisect.bisect_left(_club_name_keys, old_key)
+            if i < len(_club_name_keys) and _club_name_keys[i] == old_key:
+                _club_name_keys.pop(i)
+
+    _club_names[cid] = name
+    if row is not None:
+        _club_rows[cid] = row
+
+    key = normalize(name)
+    if key not in _club_name_index:
+        _club_name_index[key] = []
+        bisect.insort(_club_name_keys, key)
+    if cid not in _club_name_index[key]:
+        _club_name_index[key].append(cid)
+
+def _club_row(club_id: str) -> dict:
+    return _club_rows.get(club_id) or {"clubInfo": {"name": _club_names.get(club_id, f"Club {club_id}"), "clubId": club_id}}
+
+def lookup_club_local(query: str, limit: int = 25) -> list[dict]:
+    """
+    Resolve a club name/ID from memory: exact clubId, then normalized exact + prefix
+    name matches, then a strict fuzzy match. Returns search-shaped rows ({"clubInfo": ...}).
+    """
+    q = (query or "").strip()
+    if q.isdigit():
+        return [_club_row(q)] if q in _club_names else []
+
+    key = normalize(q)
+    if not key:
+        return []
+
+    ids: list[str] = list(_club_name_index.get(key, []))
+
+    i = bisect.bisect_left(_club_name_keys, key)
+    while i < len(_club_name_keys) and _club_name_keys[i].startswith(key) and len(ids) < limit:
+        for cid in _club_name_index[_club_name_keys[i]]:
+            if cid not in ids:
+                ids.append(cid)
+        i += 1
+
+    if not ids and len(key) >= 4 and _club_name_keys:
+        best = process.extractOne(key, _club_name_keys, scorer=fuzz.ratio, score_cutoff=CLUB_FUZZY_CUTOFF)
+        if best:
+            ids = list(_club_name_index[best[0]])
+
+    return [_club_row(cid) for cid in ids[:limit]]
+
+async def load_club_names_from_db():
+    """Seed the name index from the Postgres club_mapping table (db.py), if configured."""
+    if not os.getenv("DB_HOST"):
+        return
+    try:
+        mappings = await fetch_all_club_mappings()
+        for cid, name in mappings.items():
+            remember_club_name(cid, name)
+        print(f"[EA] loaded {len(mappings)} club names from club_mapping")
+    except Exception as e:
+        print(f"[EA] could not load club_mapping table: {e}")
+
+for _cid, _name in club_mapping.items():
+    remember_club_name(_cid, _name)
+
+def _merge_club_rows(results: list, local: list) -> list:
+    """EA rows first, then local index rows for clubs EA didn't return."""
+    seen = {str((r.get("clubInfo") or {}).get("clubId")) for r in results}
+    return list(results) + [r for r in local if str((r.get("clubInfo") or {}).get("clubId")) not in seen]
+
 async def search_clubs_ea(query: str) -> list:
-    """Partial-name search with retries/backoff."""
+    """
+    Partial-name search. An exact clubId or exact (normalized) name is answered from the
+    local index; looser prefix/fuzzy hits are merged with the EA search results.
+    """
     if not query or not query.strip():
         return []
 
+    q = query.strip()
+    key = normalize(q)
+    local = lookup_club_local(q)
+    if local and (q.isdigit() or key in _club_name_index):
+        return local
+
+    cached = _club_search_cache.get(key)
+    if cached and time.monotonic() - cached[0] <= CLUB_SEARCH_TTL:
+        _club_search_cache.move_to_end(key)
+        return _merge_club_rows(cached[1], local)
+
     data = await _ea_get_json(
         "https://proclubs.ea.com/api/fc/allTimeLeaderboard/search",
-        {"platform": PLATFORM, "clubName": query.strip()},
+        {"platform": PLATFORM, "clubName": q},
     )
 
     if not isinstance(data, list):
-        return []
+        return list(local)
 
-    return [
+    results = [
         c for c in data
         if c.get("clubInfo", {}).get("name", "").strip().lower() != "none of these"
     ]
-    
+
+    for c in results:
+        info = c.get("clubInfo") or {}
+        remember_club_name(info.get("clubId"), info.get("name"), row=c)
+
+    if results:
+        _club_search_cache[key] = (time.monotonic(), results)
+        _club_search_cache.move_to_end(key)
+        while len(_club_search_cache) > CLUB_SEARCH_CACHE_MAX:
+            _club_search_cache.popitem(last=False)
+
+    return _merge_club_rows(results, local)
+
+# --- Shared match history (one EA request per club/match type, shared by all callers) ---
+EA_MATCHES_URL = "https://proclubs.ea.com/api/fc/clubs/matches"
+EA_MATCH_TYPES = ["leagueMatch", "playoffMatch", "friendlyMatch"]
+EA_MATCH_FANOUT_LIMIT = int(os.getenv("EA_MATCH_FANOUT_LIMIT", "3"))
+
+_match_inflight: dict[tuple[str, str, str], asyncio.Future] = {}
+
+def _match_timestamp(match: dict) -> int:
+    try:
+        return int(match.get("timestamp", 0) or 0)
+    except (TypeError, ValueError):
+        return 0
+
+async def _fetch_club_matches(club_id: str, match_type: str) -> list[dict]:
+    data = await _ea_get_json(
+        EA_MATCHES_URL,
+        {"matchType": match_type, "platform": PLATFORM, "clubIds": club_id},
+        not_found=[],  # no matches of this type: an answer, not an error
+    )
+    if not isinstance(data, list):
+        return []
+
+    matches = [m for m in data if isinstance(m, dict)]
+    for m in matches:
+        m["_matchType"] = match_type  # keep track of type
+    matches.sort(key=_match_timestamp, reverse=True)
+    return matches
+
+async def get_club_matches(club_id: str | int, match_type: str) -> list[dict]:
+    """
+    Matches for one club + match type, newest first.
+    Concurrent callers asking for the same (platform, club, type) share a single EA request.
+    The match dicts are shared between callers, so treat them as read-only.
+    """
+    key = (PLATFORM, str(club_id), match_type)
+
+    fut = _match_inflight.get(key)
+    if fut is None:
+        fut = asyncio.ensure_future(_fetch_club_matches(str(club_id), match_type))
+        _match_inflight[key] = fut
+        fut.add_done_callback(lambda _f, k=key: _match_inflight.pop(k, None))
+
+    # shield: one caller giving up must not cancel the request for everyone else
+    return list(await asyncio.shield(fut))
+
+async def fetch_matches_by_type(
+    club_id: str | int,
+    match_types: list[str] | None = None,
+    max_concurrency: int = EA_MATCH_FANOUT_LIMIT,
+) -> dict[str, list[dict]]:
+    """
+    Fetch several match types for one club concurrently (at most max_concurrency
+    requests at once). A failing type is logged and comes back as an empty list
+    so it doesn't take the other types down with it.
+    """
+    types = list(match_types or EA_MATCH_TYPES)
+    sem = asyncio.Semaphore(max(1, max_concurrency))
+
+    async def _one(mt: str) -> list[dict]:
+        async with sem:
+            try:
+                return await get_club_matches(club_id, mt)
+            except Exception as e:
+                print(f"[EA] {mt} matches failed for {club_id}: {e}")
+                return []
+
+    results = await asyncio.gather(*(_one(mt) for mt in types))
+    return dict(zip(types, results))
+
+async def get_club_match_history(club_id: str | int, match_types: list[str] | None = None) -> list[dict]:
+    """All matches for a club across the given match types (default: league/playoff/friendly), newest first."""
+    by_type = await fetch_matches_by_type(club_id, match_types)
+
+    all_matches = [m for matches in by_type.values() for m in matches]
+    all_matches.sort(key=_match_timestamp, reverse=True)
+
+    if all_matches and not match_types:
+        record_last_played(club_id, _match_timestamp(all_matches[0]))
+    return all_matches
+
+# --- Shared last-played cache (clubId -> newest match time), optionally persisted to app_store ---
+LAST_PLAYED_TTL = int(os.getenv("LAST_PLAYED_TTL", "1800"))
+LAST_PLAYED_STORE_KEY = "last_played.json"
+LAST_PLAYED_PERSIST = os.getenv("LAST_PLAYED_PERSIST", "1").strip().lower() not in ("0", "false", "no")
+LAST_PLAYED_SAVE_INTERVAL = int(os.getenv("LAST_PLAYED_SAVE_INTERVAL", "300"))
+
+# clubId -> [recorded_at (epoch seconds), newest match timestamp]
+_last_played: dict[str, list[float]] = {}
+_last_played_dirty = False
+
+def record_last_played(club_id: str | int, match_ts: int):
+    """Remember a club's newest match time. A timestamp of 0 caches "no matches" for the same TTL."""
+    global _last_played_dirty
+    _last_played[str(club_id)] = [time.time(), max(0, int(match_ts or 0))]
+    _last_played_dirty = True
+
+def _last_played_entry(club_id: str | int) -> list[float] | None:
+    entry = _last_played.get(str(club_id))
+    if not entry:
+        return None
+    if time.time() - entry[0] > LAST_PLAYED_TTL:
+        _last_played.pop(str(club_id), None)
+        return None
+    return entry
+
+def has_cached_last_played(club_id: str | int) -> bool:
+    """True if the club has a fresh entry, including a cached "no matches"."""
+    return _last_played_entry(club_id) is not None
+
+def cached_last_played(club_id: str | int) -> datetime | None:
+    """Cached last-played time, or None if unknown, stale, or the club has no matches."""
+    entry = _last_played_entry(club_id)
+    if not entry or entry[1] <= 0:
+        return None
+    return datetime.fromtimestamp(entry[1], tz=timezone.utc)
+
+def _prune_last_played():
+    cutoff = time.time() - LAST_PLAYED_TTL
+    for cid in [cid for cid, (recorded_at, _) in _last_played.items() if recorded_at < cutoff]:
+        _last_played.pop(cid, None)
+
+async def load_last_played_store():
+    if not (DB_POOL and LAST_PLAYED_PERSIST):
+        return
+    try:
+        data = await db_load_json(LAST_PLAYED_STORE_KEY, {})
+        for cid, entry in (data or {}).items():
+            if isinstance(entry, list) and len(entry) == 2:
+                _last_played.setdefault(str(cid), [float(entry[0]), int(entry[1])])
+        _prune_last_played()
+        print(f"[EA] loaded {len(_last_played)} last-played entries from Postgres")
+    except Exception as e:
+        print(f"[EA] failed to load last-played cache: {e}")
+
+async def save_last_played_store():
+    global _last_played_dirty
+    if not (DB_POOL and LAST_PLAYED_PERSIST and _last_played_dirty):
+        return
+    _prune_last_played()
+    _last_played_dirty = False
+    try:
+        await db_save_json(LAST_PLAYED_STORE_KEY, _last_played)
+    except Exception as e:
+        _last_played_dirty = True
+        print(f"[EA] failed to save last-played cache: {e}")
+
+# --- Popular-club pre-warming (refresh hot clubs before their cache entries expire) ---
+PREWARM_TOP_K = int(os.getenv("PREWARM_TOP_K", "10"))
+PREWARM_INTERVAL = int(os.getenv("PREWARM_INTERVAL", "20"))
+PREWARM_HALF_LIFE = float(os.getenv("PREWARM_HALF_LIFE", "3600"))
+# a club is only pre-warmed while it is still being looked up
+PREWARM_ACTIVE_WINDOW = int(os.getenv("PREWARM_ACTIVE_WINDOW", "900"))
+PREWARM_MIN_SCORE = float(os.getenv("PREWARM_MIN_SCORE", "1.0"))
+# always kept warm: our own club plus any configured rivals
+PREWARM_CLUB_IDS = [CLUB_ID] + [
+    x.strip()
+    for x in os.getenv("PREWARM_CLUB_IDS", "").split(",")
+    if x.strip() and x.strip() != CLUB_ID
+]
+
+# clubId -> [decayed query score, last update (epoch seconds)]
+_club_query_scores: dict[str, list[float]] = {}
+
+def _decayed_score(entry: list[float], now: float) -> float:
+    score, updated = entry
+    return score * math.pow(0.5, (now - updated) / PREWARM_HALF_LIFE)
+
+def record_club_query(club_id: str | int):
+    """Count a user lookup of a club; older lookups fade out with PREWARM_HALF_LIFE."""
+    cid = str(club_id or "").strip()
+    if not cid.isdigit():
+        return
+    now = time.time()
+    entry = _club_query_scores.get(cid)
+    _club_query_scores[cid] = [(_decayed_score(entry, now) if entry else 0.0) + 1.0, now]
+
+    # keep the table small: drop clubs whose score has faded to nothing
+    if len(_club_query_scores) > PREWARM_TOP_K * 20:
+        for old in [k for k, v in _club_query_scores.items() if _decayed_score(v, now) < 0.05]:
+            _club_query_scores.pop(old, None)
+
+def popular_club_ids(k: int = PREWARM_TOP_K) -> list[str]:
+    """Configured clubs plus the top-k clubs queried within PREWARM_ACTIVE_WINDOW with a score above PREWARM_MIN_SCORE."""
+    now = time.time()
+    scores = {
+        cid: _decayed_score(entry, now)
+        for cid, entry in _club_query_scores.items()
+        if now - entry[1] <= PREWARM_ACTIVE_WINDOW
+    }
+    ranked = sorted(
+        (cid for cid, score in scores.items() if score >= PREWARM_MIN_SCORE),
+        key=scores.get,
+        reverse=True,
+    )
+    out = list(PREWARM_CLUB_IDS)
+    for cid in ranked:
+        if len(out) >= max(k, len(PREWARM_CLUB_IDS)):
+            break
+        if cid not in out:
+            out.append(cid)
+    return out
+
+def _needs_prewarm(url: str, params: dict) -> bool:
+    """True on the last prewarm tick before the entry expires (never earlier than 3/4 of its TTL)."""
+    ttl = EA_CACHE_TTLS.get(_ea_endpoint(url))
+    if ttl is None:
+        return False
+    age = ea_cache_age(url, params)
+    return age is None or age >= max(ttl - PREWARM_INTERVAL, ttl * 0.75)
+
+async def prewarm_popular_clubs():
+    """Refresh match history + overallStats of the hottest clubs whose cache entries are about to expire."""
+    if ea_circuit_open():
+        return
+
+    club_ids = popular_club_ids()
+    jobs = []
+
+    for cid in club_ids:
+        for mt in EA_MATCH_TYPES:
+            params = {"matchType": mt, "platform": PLATFORM, "clubIds": cid}
+            if _needs_prewarm(EA_MATCHES_URL, params):
+                jobs.append(_ea_get_json(EA_MATCHES_URL, params, retries=1, force_refresh=True))
+
+    stale_stats = [
+        cid for cid in club_ids
+        if _needs_prewarm(EA_OVERALL_STATS_URL, {"platform": PLATFORM, "clubIds": cid})
+    ]
+    if stale_stats:
+        jobs.append(get_overall_stats_batch(stale_stats, force_refresh=True))
+
+    if jobs:
+        await asyncio.gather(*jobs, return_exceptions=True)
+
+async def prewarm_loop():
+    await client.wait_until_ready()
+    while not client.is_closed():
+        try:
+            await prewarm_popular_clubs()
+        except Exception as e:
+            print(f"[EA] prewarm error: {e}")
+        await asyncio.sleep(PREWARM_INTERVAL)
+
+async def last_played_persist_loop():
+    await client.wait_until_ready()
+    while not client.is_closed():
+        await asyncio.sleep(LAST_PLAYED_SAVE_INTERVAL)
+        await save_last_played_store()
+
 from datetime import datetime, timezone
 
 async def get_current_squad(club_id: str) -> list[str]:
@@ -696,20 +1300,15 @@ async def get_last_played_timestamp(club_id: str | int) -> datetime | None:
     across league, playoff, and friendly — or None if no matches.
     """
     club_id = str(club_id)
-    match_types = ["leagueMatch", "playoffMatch", "friendlyMatch"]
     latest_ts = 0
 
+    if has_cached_last_played(club_id):
+        return cached_last_played(club_id)
+
     try:
-        for mt in match_types:
-            data = await _ea_get_json(
-                "https://proclubs.ea.com/api/fc/clubs/matches",
-                {"matchType": mt, "platform": PLATFORM, "clubIds": club_id},
-            ) or []
-            # Find max timestamp among returned matches (if any)
-            for m in data:
-                ts = int(m.get("timestamp", 0) or 0)
-                if ts > latest_ts:
-                    latest_ts = ts
+        history = await get_club_match_history(club_id)
+        if history:
+            latest_ts = _match_timestamp(history[0])
     except Exception as e:
         print(f"[ERROR] get_last_played_timestamp({club_id}): {e}")
 
@@ -731,6 +1330,108 @@ async def get_last_played_timestamp(club_id: str | int) -> datetime | None:
         mins = int(delta.total_seconds() // 60)
         return f"{mins}m ago"
 
+# --- Batched multi-club lookups (EA accepts a comma-separated clubIds list) ---
+EA_OVERALL_STATS_URL = "https://proclubs.ea.com/api/fc/clubs/overallStats"
+EA_BATCH_SIZE = int(os.getenv("EA_BATCH_SIZE", "10"))
+
+def _chunks(items: list, size: int) -> list[list]:
+    size = max(1, size)
+    return [items[i:i + size] for i in range(0, len(items), size)]
+
+async def get_club_matches_batch(club_ids: list[str | int], match_type: str) -> dict[str, list[dict] | None]:
+    """
+    One matches request per EA_BATCH_SIZE clubs instead of one per club.
+    The combined response is split back out per club using each match's `clubs` keys.
+    Clubs whose request failed map to None; [] means EA answered with no matches.
+    """
+    ids = list(dict.fromkeys(str(c) for c in club_ids))
+    out: dict[str, list[dict] | None] = {cid: [] for cid in ids}
+
+    async def _chunk(chunk: list[str]):
+        try:
+            data = await _ea_get_json(
+                EA_MATCHES_URL,
+                {"matchType": match_type, "platform": PLATFORM, "clubIds": ",".join(chunk)},
+                not_found=[],
+            )
+        except Exception as e:
+            print(f"[EA] {match_type} batch failed for {len(chunk)} clubs: {e}")
+            data = None
+        if not isinstance(data, list):
+            for cid in chunk:
+                out[cid] = None
+            return
+        for m in data:
+            if not isinstance(m, dict):
+                continue
+            m["_matchType"] = match_type
+            for cid in (m.get("clubs") or {}):
+                if out.get(cid) is not None:
+                    out[cid].append(m)
+
+    await asyncio.gather(*(_chunk(c) for c in _chunks(ids, EA_BATCH_SIZE)))
+
+    for matches in out.values():
+        if matches:
+            matches.sort(key=_match_timestamp, reverse=True)
+    return out
+
+async def get_overall_stats_batch(club_ids: list[str | int], force_refresh: bool = False) -> dict[str, dict]:
+    """
+    overallStats for many clubs in as few requests as possible. Each club's entry is
+    also stored under its single-club cache key, so a later get_club_stats is a cache hit.
+    """
+    ids = list(dict.fromkeys(str(c) for c in club_ids))
+    out: dict[str, dict] = {}
+
+    async def _chunk(chunk: list[str]):
+        data = await _ea_get_json(
+            EA_OVERALL_STATS_URL,
+            {"platform": PLATFORM, "clubIds": ",".join(chunk)},
+            force_refresh=force_refresh,
+        )
+        if not isinstance(data, list):
+            return
+        for entry in data:
+            if not isinstance(entry, dict):
+                continue
+            cid = str(entry.get("clubId") or "")
+            if cid in ids:
+                out[cid] = entry
+                _ea_cache_put(_ea_cache_key(EA_OVERALL_STATS_URL, {"platform": PLATFORM, "clubIds": cid}), [entry])
+
+    await asyncio.gather(*(_chunk(c) for c in _chunks(ids, EA_BATCH_SIZE)))
+    return out
+
+async def get_last_played_batch(club_ids: list[str | int]) -> dict[str, datetime | None]:
+    """Most recent match time for each club, using batched matches requests for every match type."""
+    ids = list(dict.fromkeys(str(c) for c in club_ids))
+    latest = {cid: 0 for cid in ids}
+    failed = set()
+
+    try:
+        per_type = await asyncio.gather(*(get_club_matches_batch(ids, mt) for mt in EA_MATCH_TYPES))
+        for by_club in per_type:
+            for cid, matches in by_club.items():
+                if matches is None:
+                    failed.add(cid)
+                elif matches:
+                    latest[cid] = max(latest[cid], _match_timestamp(matches[0]))
+    except Exception as e:
+        print(f"[ERROR] get_last_played_batch: {e}")
+        failed.update(ids)
+
+    # only clubs every match type answered for are cached, so a failed request
+    # isn't remembered as "no matches"
+    for cid, ts in latest.items():
+        if cid not in failed:
+            record_last_played(cid, ts)
+
+    return {
+        cid: datetime.fromtimestamp(ts, tz=timezone.utc) if ts > 0 else None
+        for cid, ts in latest.items()
+    }
+
 def format_last_played(dt: datetime | None) -> str:
     """Format a datetime into a human-friendly 'last played' string."""
     if not dt:
@@ -765,22 +1466,136 @@ def build_crest_url(team_id: str | int | None) -> str | None:
 async def warm_ea_session():
     try:
         print("[EA] Warming session...")
-        await _ea_get_json(
-            "https://proclubs.ea.com/api/fc/allTimeLeaderboard",
-            {"platform": PLATFORM},
-            retries=3,
-        )
+        await refresh_leaderboard_snapshot(force=True)
         await asyncio.sleep(1.5)
         print("[EA] Warm session complete.")
     except Exception as e:
         print(f"[EA] Warm session failed: {e}")
 
+async def warm_uex_commodity_catalog():
+    try:
+        await _commodities_dataset.get()
+    except Exception as e:
+        print(f"[UEX] failed to warm commodity catalog: {e}")
+
 async def warm_scwiki_ship_cache():
     try:
         await get_all_ships_scwiki()
         print("[SCWIKI] ship cache warmed")
     except Exception as e:
         print(f"[SCWIKI] failed to warm cache: {e}")
+
+# --- Catalog snapshot (warm starts for ships, terminals and commodities) ---
+CATALOG_SNAPSHOT_VERSION = 1
+CATALOG_SNAPSHOT_KEY = "catalog_snapshot.json"
+CATALOG_SNAPSHOT_PATH = os.getenv("CATALOG_SNAPSHOT_PATH", "catalog_snapshot.json.gz")
+CATALOG_SNAPSHOT_MAX_AGE = int(os.getenv("CATALOG_SNAPSHOT_MAX_AGE", str(7 * 24 * 3600)))
+CATALOG_SNAPSHOT_SAVE_INTERVAL = int(os.getenv("CATALOG_SNAPSHOT_SAVE_INTERVAL", "1800"))
+
+_catalog_snapshot_saved: dict[str, float] = {}  # catalog -> dataset.loaded_at last written
+
+def _snapshot_datasets() -> dict[str, "RefreshableDataset"]:
+    return {
+        "ships": _ships_dataset,
+        "scapi_ships": _scapi_ships_dataset,
+        "terminals": _terminals_dataset,
+        "commodities": _commodities_dataset,
+    }
+
+def _read_snapshot_file(path: str):
+    if not os.path.exists(path):
+        return None
+    with gzip.open(path, "rt", encoding="utf-8") as f:
+        return json.load(f)
+
+def _write_snapshot_file(path: str, snapshot: dict):
+    tmp_path = f"{path}.tmp"
+    with gzip.open(tmp_path, "wt", encoding="utf-8", compresslevel=6) as f:
+        json.dump(snapshot, f, separators=(",", ":"))
+    os.replace(tmp_path, path)
+
+async def load_catalog_snapshot():
+    """
+    Seed the catalog datasets from the last snapshot (Postgres app_store, else a local
+    gzip file) so lookups and autocomplete work right away, then revalidate each
+    catalog from its API in the background.
+    """
+    try:
+        if DB_POOL:
+            snapshot = await db_load_json(CATALOG_SNAPSHOT_KEY, {})
+        else:
+            snapshot = await asyncio.to_thread(_read_snapshot_file, CATALOG_SNAPSHOT_PATH)
+    except Exception as e:
+        print(f"[CATALOG] failed to read snapshot: {e}")
+        return
+
+    if not snapshot or snapshot.get("version") != CATALOG_SNAPSHOT_VERSION:
+        print("[CATALOG] no usable snapshot; catalogs will load from the APIs")
+        return
+
+    now = time.time()
+    loaded = []
+    for name, dataset in _snapshot_datasets().items():
+        entry = (snapshot.get("catalogs") or {}).get(name) or {}
+        items = entry.get("items")
+        age = now - float(entry.get("loaded_at") or 0)
+
+        if dataset.data is not None or not items or age > CATALOG_SNAPSHOT_MAX_AGE:
+            continue
+
+        dataset.set_data(items, loaded_at=time.monotonic() - age)
+        _catalog_snapshot_saved[name] = dataset.loaded_at
+        asyncio.create_task(dataset.refresh())
+        loaded.append(f"{name}={len(items)} ({age / 60:.0f}m old)")
+
+    print(f"[CATALOG] loaded snapshot: {', '.join(loaded) or 'nothing fresh enough'}")
+
+async def save_catalog_snapshot():
+    """Write loaded catalogs to the snapshot store if any has reloaded since the last write."""
+    datasets = _snapshot_datasets()
+    if all(
+        ds.data is None or _catalog_snapshot_saved.get(name) == ds.loaded_at
+        for name, ds in datasets.items()
+    ):
+        return
+
+    now_epoch = time.time()
+    now_mono = time.monotonic()
+    catalogs = {}
+    written = {}
+    for name, ds in datasets.items():
+        if ds.data is None:
+            continue
+        catalogs[name] = {
+            "loaded_at": now_epoch - (now_mono - ds.loaded_at),
+            "items": [as_plain_dict(item) for item in ds.data],
+        }
+        written[name] = ds.loaded_at
+
+    snapshot = {
+        "version": CATALOG_SNAPSHOT_VERSION,
+        "saved_at": now_epoch,
+        "catalogs": catalogs,
+    }
+
+    try:
+        if DB_POOL:
+            await db_save_json(CATALOG_SNAPSHOT_KEY, snapshot)
+        else:
+            await asyncio.to_thread(_write_snapshot_file, CATALOG_SNAPSHOT_PATH, snapshot)
+        _catalog_snapshot_saved.update(written)
+        counts = ", ".join(f"{name}={len(entry['items'])}" for name, entry in catalogs.items())
+        print(f"[CATALOG] snapshot saved: {counts}")
+    except Exception as e:
+        print(f"[CATALOG] failed to save snapshot: {e}")
+
+async def catalog_snapshot_loop():
+    await client.wait_until_ready()
+    # first write shortly after boot, once the warm-up loads have landed
+    await asyncio.sleep(120)
+    while not client.is_closed():
+        await save_catalog_snapshot()
+        await asyncio.sleep(CATALOG_SNAPSHOT_SAVE_INTERVAL)
         
 async def get_club_stats(club_id):
     data = await _ea_get_json(
@@ -807,17 +1622,8 @@ async def get_club_stats(club_id):
     }
     
 async def get_recent_form(club_id):
-    match_types = ["leagueMatch", "playoffMatch", "friendlyMatch"]
-    all_matches = []
     try:
-        for match_type in match_types:
-            data = await _ea_get_json(
-                "https://proclubs.ea.com/api/fc/clubs/matches",
-                {"matchType": match_type, "platform": PLATFORM, "clubIds": club_id},
-            ) or []
-            all_matches.extend(data)
-
-        all_matches.sort(key=lambda x: x.get("timestamp", 0), reverse=True)
+        all_matches = await get_club_match_history(club_id)
         results = []
         for match in all_matches[:5]:
             clubs_data = match.get("clubs", {}) or {}
@@ -846,27 +1652,12 @@ async def get_last5_matches_summary(club_id: str) -> str:
     • League — vs Onion Bag (2–1) ✅
     """
     club_id = str(club_id)
-    match_types = ["leagueMatch", "playoffMatch", "friendlyMatch"]
-    all_matches = []
     try:
-        for mt in match_types:
-            data = await _client_ea.get(
-                "https://proclubs.ea.com/api/fc/clubs/matches",
-                params={"matchType": mt, "platform": PLATFORM, "clubIds": club_id},
-            )
-            if data.status_code == 404:
-                continue
-            data.raise_for_status()
-            arr = data.json() or []
-            for m in arr:
-                m["_matchType"] = mt
-            all_matches.extend(arr)
-
+        # newest first
+        all_matches = await get_club_match_history(club_id)
         if not all_matches:
             return "No recent matches"
 
-        # newest first
-        all_matches.sort(key=lambda x: x.get("timestamp", 0), reverse=True)
         take = all_matches[:5]
 
         lines = []
@@ -903,19 +1694,8 @@ async def get_last5_matches_summary(club_id: str) -> str:
         return "No recent matches"
 
 async def get_last_match(club_id):
-    match_types = ["leagueMatch", "playoffMatch", "friendlyMatch"]
-    all_matches = []
     try:
-        for match_type in match_types:
-            data = await _ea_get_json(
-                "https://proclubs.ea.com/api/fc/clubs/matches",
-                {"matchType": match_type, "platform": PLATFORM, "clubIds": club_id},
-            ) or []
-            for m in data:
-                m["_matchType"] = match_type
-            all_matches.extend(data)
-
-        all_matches.sort(key=lambda x: x.get("timestamp", 0), reverse=True)
+        all_matches = await get_club_match_history(club_id)
         if not all_matches:
             return "Last match data not available."
 
@@ -944,15 +1724,91 @@ async def get_last_match(club_id):
         print(f"[ERROR] Failed to fetch last match: {e}")
         return "Last match data not available."
 
+# --- All-time leaderboard snapshot (one download per refresh interval) ---
+EA_LEADERBOARD_URL = "https://proclubs.ea.com/api/fc/allTimeLeaderboard"
+LEADERBOARD_REFRESH_SECONDS = int(os.getenv("LEADERBOARD_REFRESH_SECONDS", "900"))
+
+# by_club: clubId -> leaderboard entry (rank, skillRating, name, ...); ranked: entries sorted by rank
+LEADERBOARD_MIN_BACKOFF = int(os.getenv("LEADERBOARD_MIN_BACKOFF", "60"))
+LEADERBOARD_MAX_BACKOFF = int(os.getenv("LEADERBOARD_MAX_BACKOFF", "900"))
+
+_leaderboard = {"by_club": {}, "ranked": [], "updated": 0.0, "failures": 0, "retry_at": 0.0}
+_leaderboard_lock = asyncio.Lock()
+
+def _rank_sort_key(entry: dict) -> int:
+    try:
+        return int(entry.get("rank", 9999))
+    except (TypeError, ValueError):
+        return 9999
+
+def _leaderboard_refresh_due() -> bool:
+    now = time.monotonic()
+    return now - _leaderboard["updated"] >= LEADERBOARD_REFRESH_SECONDS and now >= _leaderboard["retry_at"]
+
+async def refresh_leaderboard_snapshot(force: bool = False) -> bool:
+    """
+    Re-download the all-time leaderboard if the snapshot is older than LEADERBOARD_REFRESH_SECONDS.
+    After a failed download further attempts wait an exponentially growing backoff, and
+    callers that already have a snapshot never queue behind a refresh in progress.
+    """
+    if not force and not _leaderboard_refresh_due():
+        return bool(_leaderboard["ranked"])
+    if _leaderboard_lock.locked() and _leaderboard["ranked"]:
+        return True
+
+    async with _leaderboard_lock:
+        # another caller may have refreshed (or failed) while we waited for the lock
+        if not force and not _leaderboard_refresh_due():
+            return bool(_leaderboard["ranked"])
+
+        data = await _ea_get_json(EA_LEADERBOARD_URL, {"platform": PLATFORM}, retries=3, use_cache=False)
+        if not isinstance(data, list):
+            _leaderboard["failures"] += 1
+            backoff = min(LEADERBOARD_MAX_BACKOFF, LEADERBOARD_MIN_BACKOFF * 2 ** (_leaderboard["failures"] - 1))
+            _leaderboard["retry_at"] = time.monotonic() + backoff
+            print(f"[RANK] leaderboard snapshot refresh failed; keeping previous snapshot, retrying in {backoff}s")
+            return bool(_leaderboard["ranked"])
+
+        entries = [e for e in data if isinstance(e, dict) and e.get("clubId") is not None]
+        for e in entries:
+            remember_club_name(e["clubId"], e.get("name") or (e.get("clubInfo") or {}).get("name"))
+        _leaderboard["ranked"] = sorted(entries, key=_rank_sort_key)
+        _leaderboard["by_club"] = {str(e["clubId"]): e for e in entries}
+        _leaderboard["updated"] = time.monotonic()
+        _leaderboard["failures"] = 0
+        _leaderboard["retry_at"] = 0.0
+        print(f"[RANK] leaderboard snapshot refreshed ({len(entries)} clubs)")
+        return True
+
+async def get_leaderboard_top(limit: int = 100) -> list[dict]:
+    """Leaderboard entries sorted by rank, served from the snapshot."""
+    await refresh_leaderboard_snapshot()
+    return _leaderboard["ranked"][:limit]
+
+async def leaderboard_refresh_loop():
+    await client.wait_until_ready()
+    while not client.is_closed():
+        try:
+            await refresh_leaderboard_snapshot()
+        except Exception as e:
+            print(f"[RANK] leaderboard refresh loop error: {e}")
+        await asyncio.sleep(LEADERBOARD_REFRESH_SECONDS)
+
 async def get_club_rank(club_id: str | int):
     club_id = str(club_id)
 
+    entry = _leaderboard["by_club"].get(club_id)
+    if entry and entry.get("rank") is not None:
+        return entry["rank"]
+
     try:
-        resp = await _client_ea.get(
+        resp = await _ea_send(
             "https://proclubs.ea.com/api/fc/allTimeLeaderboard/club",
-            params={"platform": PLATFORM, "clubIds": club_id},
+            {"platform": PLATFORM, "clubIds": club_id},
         )
-        if resp.status_code == 200:
+        if resp is None:
+            pass  # circuit open
+        elif resp.status_code == 200:
             data = resp.json()
             if isinstance(data, dict):
                 raw = data.get("raw") or []
@@ -966,38 +1822,20 @@ async def get_club_rank(club_id: str | int):
     except Exception as e:
         print(f"[RANK] exception (club endpoint): {e}")
 
+    # fallback: the leaderboard snapshot (only downloads if it has gone stale)
     try:
-        resp2 = await _client_ea.get(
-            "https://proclubs.ea.com/api/fc/allTimeLeaderboard",
-            params={"platform": PLATFORM},
-        )
-        if resp2.status_code == 200:
-            data2 = resp2.json()
-            if isinstance(data2, list):
-                for entry in data2:
-                    if str(entry.get("clubId")) == club_id:
-                        return entry.get("rank", "Unranked")
-            else:
-                print(f"[RANK] unexpected list payload: {type(data2)}")
-        else:
-            print(f"[RANK] list endpoint {resp2.status_code}: {resp2.text[:160]}")
+        await refresh_leaderboard_snapshot()
+        entry = _leaderboard["by_club"].get(club_id)
+        if entry:
+            return entry.get("rank", "Unranked")
     except Exception as e:
-        print(f"[RANK] exception (list fallback): {e}")
+        print(f"[RANK] exception (snapshot fallback): {e}")
 
     return "Unranked"
 
 async def get_days_since_last_match(club_id):
-    match_types = ["leagueMatch", "playoffMatch", "friendlyMatch"]
-    all_matches = []
     try:
-        for match_type in match_types:
-            data = await _ea_get_json(
-                "https://proclubs.ea.com/api/fc/clubs/matches",
-                {"matchType": match_type, "platform": PLATFORM, "clubIds": club_id},
-            ) or []
-            all_matches.extend(data)
-
-        all_matches.sort(key=lambda x: x.get("timestamp", 0), reverse=True)
+        all_matches = await get_club_match_history(club_id)
         if not all_matches:
             return None
 
@@ -1010,22 +1848,23 @@ async def get_days_since_last_match(club_id):
         return None
 
 async def get_squad_names(club_id):
-    url = f"https://proclubs.ea.com/api/fc/club/members?platform={PLATFORM}&clubId={club_id}"
-    headers = {"User-Agent": "Mozilla/5.0"}
     try:
-        async with httpx.AsyncClient(timeout=10) as client_http:
-            response = await client_http.get(url, headers=headers)
-            if response.status_code == 200:
-                data = response.json()
-                members = data.get("members", [])
-                names = [member.get("playername") for member in members if member.get("playername")]
-                return names
+        data = await _ea_get_json(
+            "https://proclubs.ea.com/api/fc/club/members",
+            {"platform": PLATFORM, "clubId": str(club_id)},
+            retries=3,
+        )
+        if isinstance(data, dict):
+            members = data.get("members", [])
+            names = [member.get("playername") for member in members if member.get("playername")]
+            return names
     except Exception as e:
         print(f"[ERROR] Failed to fetch squad names: {e}")
     return []
 
 async def fetch_all_stats_for_club(club_id: str):
     club_id = str(club_id)
+    record_club_query(club_id)
     stats_task = asyncio.create_task(get_club_stats(club_id))
     form_task = asyncio.create_task(get_recent_form(club_id))
     days_task = asyncio.create_task(get_days_since_last_match(club_id))
@@ -1174,19 +2013,8 @@ async def get_last5_player_totals(club_id: str):
     across league/playoff/friendly.
     """
     club_id = str(club_id)
-    match_types = ["leagueMatch", "playoffMatch", "friendlyMatch"]
-    all_matches = []
-
-    for match_type in match_types:
-        data = await _ea_get_json(
-            "https://proclubs.ea.com/api/fc/clubs/matches",
-            {"matchType": match_type, "platform": PLATFORM, "clubIds": club_id},
-        ) or []
-        for m in data:
-            m["_matchType"] = match_type
-        all_matches.extend(data)
-
-    all_matches.sort(key=lambda x: x.get("timestamp", 0), reverse=True)
+    record_club_query(club_id)
+    all_matches = await get_club_match_history(club_id)
     last_5 = all_matches[:5]
 
     if not last_5:
@@ -1742,10 +2570,11 @@ UEX_HEADERS = {
     "Authorization": f"Bearer {UEX_API_KEY}",
 }
 
-_client_uex = httpx.AsyncClient(
+_client_uex = make_http_client(
     timeout=20,
     headers=UEX_HEADERS,
-    follow_redirects=True,
+    max_connections=int(os.getenv("UEX_MAX_CONNECTIONS", "20")),
+    max_keepalive=int(os.getenv("UEX_MAX_KEEPALIVE", "10")),
 )
 
 STARCITIZEN_API_KEY = os.getenv("STARCITIZEN_API_KEY", "").strip()
@@ -1762,21 +2591,460 @@ _client_scapi = httpx.AsyncClient(
     }
 )
 
-async def _uex_get(resource: str, params: dict | None = None, retries: int = 3):
+# --- Streaming JSON (decode large list payloads one record at a time) ---
+_JSON_WS = " \t\r\n"
+_NEED_MORE = object()
+
+class JSONRecordStream:
+    """
+    Incremental decoder for `{"data": [{...}, {...}], ...}` or a bare top-level list.
+
+    Text is fed as it arrives; each array element is decoded on its own and projected
+    to `fields`, so the full object graph of a large payload never exists at once.
+    Other top-level keys (e.g. pagination `meta`) are kept whole in `extras`.
+    """
+
+    def __init__(self, fields=None, array_key: str = "data"):
+        self.fields = tuple(fields) if fields else None
+        self.array_key = array_key
+        self.records: list | None = None
+        self.extras: dict = {}
+        self._decoder = json.JSONDecoder()
+        self._buf = ""
+        self._pos = 0
+        self._state = "start"
+        self._in_object = False
+        self._key = None
+
+    def _project(self, value):
+        if self.fields is None or not isinstance(value, dict):
+            return value
+        return {k: value[k] for k in self.fields if k in value}
+
+    def _peek(self) -> str | None:
+        buf, pos = self._buf, self._pos
+        while pos < len(buf) and buf[pos] in _JSON_WS:
+            pos += 1
+        self._pos = pos
+        return buf[pos] if pos < len(buf) else None
+
+    def _decode(self, final: bool):
+        try:
+            value, end = self._decoder.raw_decode(self._buf, self._pos)
+        except json.JSONDecodeError:
+            if final:
+                raise
+            return _NEED_MORE
+        # A value ending right at the buffer edge may be a number cut mid-chunk.
+        if end >= len(self._buf) and not final:
+            return _NEED_MORE
+        self._pos = end
+        return value
+
+    def feed(self, text: str, final: bool = False):
+        self._buf = self._buf[self._pos:] + text
+        self._pos = 0
+
+        while True:
+            ch = self._peek()
+            if ch is None:
+                break
+
+            state = self._state
+            if state == "start":
+                if ch == "[":
+                    self.records = []
+                    self._state = "array"
+                elif ch == "{":
+                    self._in_object = True
+                    self._state = "key"
+                else:
+                    raise ValueError(f"unexpected JSON payload start {ch!r}")
+                self._pos += 1
+
+            elif state == "key":
+                if ch in ",}":
+                    self._pos += 1
+                    if ch == "}":
+                        self._state = "end"
+                    continue
+                key = self._decode(final)
+                if key is _NEED_MORE:
+                    break
+                self._key = key
+                self._state = "colon"
+
+            elif state == "colon":
+                if ch != ":":
+                    raise ValueError(f"expected ':' after {self._key!r}")
+                self._pos += 1
+                self._state = "value"
+
+            elif state == "value":
+                if self._key == self.array_key and ch == "[":
+                    self.records = []
+                    self._state = "array"
+                    self._pos += 1
+                    continue
+                value = self._decode(final)
+                if value is _NEED_MORE:
+                    break
+                self.extras[self._key] = value
+                self._state = "key"
+
+            elif state == "array":
+                if ch in ",]":
+                    self._pos += 1
+                    if ch == "]":
+                        self._state = "key" if self._in_object else "end"
+                    continue
+                value = self._decode(final)
+                if value is _NEED_MORE:
+                    break
+                self.records.append(self._project(value))
+
+            else:
+                self._pos = len(self._buf)
+                break
+
+        if final and self._state != "end":
+            raise ValueError("truncated JSON payload")
+
+async def stream_json_records(response: httpx.Response, fields=None, array_key: str = "data"):
+    """Decode a streamed response with JSONRecordStream; returns (records or None, extras)."""
+    stream = JSONRecordStream(fields, array_key)
+    text_decoder = codecs.getincrementaldecoder("utf-8")()
+
+    async for chunk in response.aiter_bytes():
+        stream.feed(text_decoder.decode(chunk))
+    stream.feed(text_decoder.decode(b"", final=True), final=True)
+
+    return stream.records, stream.extras
+
+# Fields the bot actually reads from the large list payloads.
+UEX_TERMINAL_FIELDS = (
+    "id", "name", "nickname", "code", "slug", "type",
+    "star_system_name", "system_name", "name_star_system",
+    "planet_name", "orbit_name", "moon_name", "space_station_name", "outpost_name", "city_name",
+    "is_auto_load", "is_available", "is_visible",
+)
+UEX_PRICE_FIELDS = (
+    "id_commodity", "id_terminal",
+    "commodity_name", "name_commodity", "commodity_code",
+    "terminal_name", "name_terminal", "terminal_code", "star_system_name",
+    "price_buy", "price_buy_avg", "price_sell", "price_sell_avg",
+    "scu_buy", "scu_buy_avg", "scu_sell", "scu_sell_avg", "scu_sell_stock",
+    "status_buy", "status_sell", "date_modified",
+)
+SCWIKI_SHIP_FIELDS = (
+    "id", "uuid", "slug", "name", "name_full", "game_name", "shipmatrix_name",
+    "manufacturer", "manufacturer_id", "manufacturer_name", "manufacturer_code",
+    "cargo", "cargo_capacity", "cargocapacity", "scu", "specs",
+    "crew", "foci", "focus", "role", "type", "size", "dimension", "length", "mass",
+    "production_status", "status", "description", "short_description", "excerpt", "media",
+)
+
+# --- Compact catalog records (projected fields in slots; ships also keep the rest compressed) ---
+_MISSING = object()
+
+class CatalogRecord:
+    """
+    Read-mostly stand-in for a catalog dict (ship, terminal) with the same .get() API.
+
+    Only the fields the lookups actually touch (FIELDS) are kept, in a small slotted
+    list; anything else reads as missing. ShipRecord also keeps the rest of its payload.
+    """
+
+    __slots__ = ("_values",)
+    FIELDS: tuple[str, ...] = ()
+    _index: dict[str, int] = {}
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls._index = {name: i for i, name in enumerate(cls.FIELDS)}
+
+    def __init__(self, data: dict):
+        self._values = [data.get(name, _MISSING) for name in self.FIELDS]
+
+    def raw(self) -> dict:
+        """The record as a plain dict."""
+        return {
+            name: self._values[i]
+            for name, i in self._index.items()
+            if self._values[i] is not _MISSING
+        }
+
+    def _get_extra(self, key, default):
+        return default
+
+    def get(self, key, default=None):
+        i = self._index.get(key)
+        if i is None:
+            return self._get_extra(key, default)
+        value = self._values[i]
+        return default if value is _MISSING else value
+
+    def __getitem__(self, key):
+        value = self.get(key, _MISSING)
+        if value is _MISSING:
+            raise KeyError(key)
+        return value
+
+    def __setitem__(self, key, value):
+        i = self._index.get(key)
+        if i is None:
+            raise KeyError(f"{type(self).__name__} cannot store {key!r}")
+        self._values[i] = value
+
+    def __contains__(self, key) -> bool:
+        return self.get(key, _MISSING) is not _MISSING
+
+    def keys(self):
+        return self.raw().keys()
+
+    def __repr__(self) -> str:
+        return f"<{type(self).__name__} {self.get('name')!r}>"
+
+class ShipRecord(CatalogRecord):
+    """
+    Ship row: projected fields in slots, every other field (description, media, specs
+    for build_ship_embed) as zlib-compressed JSON, decoded by raw() or a non-projected
+    get(). Callers that read many such fields should take raw() once.
+    """
+
+    __slots__ = ("_packed",)
+    # names (_ship_display_name / search), ids, cargo (_ship_scu), manufacturer
+    FIELDS = (
+        "id", "uuid", "slug", "name", "name_full", "game_name", "shipmatrix_name",
+        "cargo_capacity", "cargo", "scu", "specs",
+        "manufacturer", "manufacturer_id",
+    )
+
+    def __init__(self, data: dict):
+        super().__init__(data)
+        rest = {k: v for k, v in data.items() if k not in self._index}
+        self._packed = zlib.compress(json.dumps(rest, separators=(",", ":")).encode("utf-8"))
+
+    def _unpack(self) -> dict:
+        return json.loads(zlib.decompress(self._packed))
+
+    def raw(self) -> dict:
+        data = self._unpack()
+        data.update(super().raw())
+        return data
+
+    def _get_extra(self, key, default):
+        return self._unpack().get(key, default)
+
+class TerminalRecord(CatalogRecord):
+    __slots__ = ()
+    # names / ids, system + auto-load (raw and as precomputed by _index_terminals)
+    FIELDS = (
+        "id", "name", "code", "slug",
+        "star_system_name", "system_name", "name_star_system", "is_auto_load",
+        "_system_name", "_auto_load",
+    )
+
+def as_plain_dict(item):
+    return item.raw() if isinstance(item, CatalogRecord) else item
+
+class RefreshableDataset:
+    """
+    Async holder for a periodically reloaded catalog (terminals, ships, commodities).
+
+    Readers always get the last good snapshot. A stale snapshot triggers a background
+    reload, and only one loader runs at a time. A failed or empty load is never
+    cached as "the" answer: the next attempt waits an exponentially growing backoff.
+    With record_type, dict rows are stored as that compact record type; ttl_for(data)
+    may give one snapshot a shorter TTL than the default (e.g. an incomplete load).
+    """
+
+    def __init__(
+        self,
+        name: str,
+        loader,
+        ttl: float,
+        on_load=None,
+        min_backoff: float = 30,
+        max_backoff: float = 900,
+        record_type=None,
+        ttl_for=None,
+    ):
+        self.name = name
+        self.record_type = record_type
+        self.loader = loader
+        self.ttl = ttl
+        self.ttl_for = ttl_for
+        self.snapshot_ttl = ttl
+        self.on_load = on_load
+        self.min_backoff = min_backoff
+        self.max_backoff = max_backoff
+        self.data: list | dict | None = None
+        self.loaded_at = 0.0
+        self._failures = 0
+        self._retry_at = 0.0
+        self._task: asyncio.Task | None = None
+
+    @property
+    def is_stale(self) -> bool:
+        return self.data is None or time.monotonic() - self.loaded_at >= self.snapshot_ttl
+
+    def _can_attempt(self) -> bool:
+        return time.monotonic() >= self._retry_at
+
+    def _start_refresh(self) -> asyncio.Task:
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._load())
+        return self._task
+
+    async def _load(self):
+        try:
+            data = await self.loader()
+        except Exception as e:
+            print(f"[{self.name}] load failed: {e}")
+            data = None
+
+        if data:
+            self.set_data(data)
+        else:
+            self._failures += 1
+            backoff = min(self.max_backoff, self.min_backoff * 2 ** (self._failures - 1))
+            self._retry_at = time.monotonic() + backoff
+            kept = "keeping previous snapshot" if self.data else "no snapshot yet"
+            print(f"[{self.name}] load returned nothing; retrying in {backoff:.0f}s ({kept})")
+        return self.data
+
+    def set_data(self, data: list, loaded_at: float | None = None):
+        if self.record_type is not None:
+            data = [self.record_type(d) if isinstance(d, dict) else d for d in data]
+        if self.on_load:
+            self.on_load(data)
+        self.data = data
+        self.loaded_at = time.monotonic() if loaded_at is None else loaded_at
+        self.snapshot_ttl = self.ttl_for(data) if self.ttl_for else self.ttl
+        self._failures = 0
+        self._retry_at = 0.0
+
+    async def refresh(self) -> list:
+        """Force a reload (joins one already in flight) and return the resulting snapshot."""
+        await asyncio.shield(self._start_refresh())
+        return self.data or []
+
+    async def get(self) -> list:
+        """Current snapshot; waits for a load only when there is no snapshot at all."""
+        if self.data is None:
+            if self._can_attempt() or (self._task and not self._task.done()):
+                await asyncio.shield(self._start_refresh())
+            return self.data or []
+
+        if self.is_stale and self._can_attempt():
+            self._start_refresh()
+        return self.data
+
+    def peek(self) -> list:
+        """Current snapshot without ever waiting; kicks off a background load if needed."""
+        if self.is_stale and self._can_attempt():
+            self._start_refresh()
+        return self.data or []
+
+async def dataset_refresh_loop(dataset: RefreshableDataset, interval: float):
+    """Keep a dataset warm by reloading it every `interval` seconds."""
+    await client.wait_until_ready()
+    while not client.is_closed():
+        try:
+            await dataset.refresh()
+        except Exception as e:
+            print(f"[{dataset.name}] refresh failed: {e}")
+        await asyncio.sleep(interval)
+
+# Last body + validators per (resource, params) for UEX responses that send an
+# ETag or Last-Modified, so repeat pulls can be answered with a 304.
+UEX_CONDITIONAL_MAX_ENTRIES = int(os.getenv("UEX_CONDITIONAL_MAX_ENTRIES", "256"))
+
+_uex_validators: "OrderedDict[tuple, dict]" = OrderedDict()
+_uex_inflight: dict[tuple, asyncio.Future] = {}
+
+def _uex_request_key(resource: str, params: dict | None, fields=None) -> tuple:
+    return (
+        resource.strip("/"),
+        tuple(sorted((str(k), str(v)) for k, v in (params or {}).items())),
+        tuple(fields) if fields else None,
+    )
+
+def _uex_remember(key: tuple, r: httpx.Response, data, keep_body: bool = True):
+    etag = r.headers.get("ETag")
+    last_modified = r.headers.get("Last-Modified")
+    if not etag and not last_modified:
+        _uex_validators.pop(key, None)
+        return
+
+    _uex_validators[key] = {
+        "etag": etag,
+        "last_modified": last_modified,
+        "data": data if keep_body else None,
+    }
+    _uex_validators.move_to_end(key)
+    while len(_uex_validators) > UEX_CONDITIONAL_MAX_ENTRIES:
+        _uex_validators.popitem(last=False)
+
+async def _uex_get(resource: str, params: dict | None = None, retries: int = 3, fields=None, snapshot=None):
+    """
+    GET a UEX resource and return its `data`.
+    Concurrent callers asking for the same (resource, params) share a single request.
+    With `fields`, a list payload is stream-decoded and each row keeps only those keys.
+    With `snapshot` (returns the caller's current copy, e.g. a dataset's data), only the
+    validators are kept here and a 304 answers with snapshot() instead of a cached body.
+    """
+    key = _uex_request_key(resource, params, fields)
+
+    fut = _uex_inflight.get(key)
+    if fut is None:
+        fut = asyncio.ensure_future(_uex_fetch(resource, params, key, retries, fields, snapshot))
+        _uex_inflight[key] = fut
+        fut.add_done_callback(lambda _f, k=key: _uex_inflight.pop(k, None))
+
+    # shield: one caller giving up must not cancel the request for everyone else
+    data = await asyncio.shield(fut)
+    return list(data) if isinstance(data, list) else data
+
+async def _uex_fetch(resource: str, params: dict | None, key: tuple, retries: int = 3, fields=None, snapshot=None):
     if not UEX_API_KEY:
         raise RuntimeError("UEX_API_KEY is missing.")
 
     url = f"{UEX_API_BASE}/{resource.strip('/')}/"
 
     for attempt in range(retries):
-        try:
-            r = await _client_uex.get(url, params=params or {})
+        headers = {}
+        cached = _uex_validators.get(key)
+        if cached:
+            body = cached["data"] if cached["data"] is not None else (snapshot() if snapshot else None)
+            # nothing to answer a 304 with: make a plain request
+            if not body:
+                cached = None
+        if cached:
+            if cached["etag"]:
+                headers["If-None-Match"] = cached["etag"]
+            if cached["last_modified"]:
+                headers["If-Modified-Since"] = cached["last_modified"]
 
-            if r.status_code == 200:
-                payload = r.json()
-                if isinstance(payload, dict):
-                    return payload.get("data", payload)
-                return payload
+        try:
+            async with _client_uex.stream("GET", url, params=params or {}, headers=headers) as r:
+                if r.status_code == 304 and cached:
+                    _uex_validators.move_to_end(key)
+                    return body
+
+                if r.status_code == 200:
+                    if fields:
+                        records, extras = await stream_json_records(r, fields)
+                        data = records if records is not None else extras.get("data", extras)
+                    else:
+                        await r.aread()
+                        payload = r.json()
+                        data = payload.get("data", payload) if isinstance(payload, dict) else payload
+                    _uex_remember(key, r, data, keep_body=snapshot is None)
+                    return data
+
+                await r.aread()
 
             print(f"[UEX] {r.status_code} {url} try {attempt+1}/{retries} :: {r.text[:300]}")
 
@@ -1791,11 +3059,94 @@ async def _uex_get(resource: str, params: dict | None = None, retries: int = 3):
 
     return None
 
+@functools.lru_cache(maxsize=8192)
 def _normalize_sc_name(value: str) -> str:
     return re.sub(r"[^a-z0-9]+", "", (value or "").lower())
 
-async def get_trending_commodities(limit: int = 10) -> list[dict]:
-    data = await _uex_get("commodities_ranking")
+# --- Fuzzy matching (bigram shortlist, then token_sort_ratio on the few best) ---
+FUZZY_SHORTLIST = int(os.getenv("FUZZY_SHORTLIST", "100"))
+
+def _fuzzy_text(value: str) -> str:
+    # same tokens as fuzzywuzzy's full_process: non-ASCII dropped, "_" kept as a word character
+    ascii_only = (value or "").encode("ascii", "ignore").decode().lower()
+    return " ".join(sorted(re.findall(r"[a-z0-9_]+", ascii_only)))
+
+def _fuzzy_grams(text: str) -> dict[str, int]:
+    padded = f" {text} "
+    grams = {}
+    for i in range(len(padded) - 1):
+        gram = padded[i:i + 2]
+        grams[gram] = grams.get(gram, 0) + 1
+    return grams
+
+class FuzzyIndex:
+    """
+    Fuzzy matcher over a fixed list of strings, built once per catalog load.
+
+    Each choice is reduced to character-bigram counts held in an inverted index. A query
+    scores every choice that shares a bigram in a single pass (Dice overlap); only the
+    best FUZZY_SHORTLIST are re-scored with fuzz.token_sort_ratio, and any whose length
+    alone rules out reaching the cutoff is skipped.
+
+    This is an approximation of process.extract: a choice with a high token_sort_ratio
+    but a low bigram overlap can fall outside the shortlist and be missed.
+    """
+
+    def __init__(self, choices: list[str]):
+        self.choices = list(choices)
+        self._texts = [_fuzzy_text(c) for c in self.choices]
+        self._sizes = []
+        self._postings: dict[str, list[tuple[int, int]]] = {}
+
+        for idx, text in enumerate(self._texts):
+            grams = _fuzzy_grams(text)
+            self._sizes.append(sum(grams.values()))
+            for gram, count in grams.items():
+                self._postings.setdefault(gram, []).append((idx, count))
+
+    def __len__(self) -> int:
+        return len(self.choices)
+
+    def extract(self, query: str, limit: int = 25, cutoff: int = 0) -> list[tuple[int, int]]:
+        """(choice index, score) pairs scoring at least `cutoff`, best first."""
+        text = _fuzzy_text(query)
+        if not text or not self.choices:
+            return []
+
+        q_grams = _fuzzy_grams(text)
+        q_size = sum(q_grams.values())
+        overlap = {}
+        for gram, q_count in q_grams.items():
+            for idx, count in self._postings.get(gram, ()):
+                overlap[idx] = overlap.get(idx, 0) + min(q_count, count)
+
+        shortlist = heapq.nlargest(
+            FUZZY_SHORTLIST,
+            overlap,
+            key=lambda idx: overlap[idx] / (q_size + self._sizes[idx])
+        )
+
+        q_len = len(text)
+        scored = []
+        for idx in shortlist:
+            c_len = len(self._texts[idx])
+            # A SequenceMatcher ratio can never exceed 2*min/(sum) of the two lengths;
+            # fuzzywuzzy rounds the score, so compare the rounded bound.
+            if cutoff and round(200 * min(q_len, c_len) / (q_len + c_len)) < cutoff:
+                continue
+            score = fuzz.token_sort_ratio(query, self.choices[idx])
+            if score >= cutoff:
+                scored.append((idx, score))
+
+        scored.sort(key=lambda pair: pair[1], reverse=True)
+        return scored[:limit]
+
+    def extract_one(self, query: str, cutoff: int = 0) -> tuple[int, int] | None:
+        best = self.extract(query, limit=1, cutoff=cutoff)
+        return best[0] if best else None
+
+def _prepare_ranking(data) -> list[dict]:
+    """UEX commodities_ranking rows with monthly SCU volume fields, best CAX score first."""
     if not isinstance(data, list):
         return []
 
@@ -1817,36 +3168,86 @@ async def get_trending_commodities(limit: int = 10) -> list[dict]:
         key=lambda x: float(x.get("cax_score") or 0),
         reverse=True
     )
-    return cleaned[:limit]
+    return cleaned
 
-async def search_commodity_uex(query: str) -> list[dict]:
-    data = await _uex_get("commodities")
+async def get_trending_commodities(limit: int = 10) -> list[dict]:
+    view = get_trade_view()
+    if view is not None:
+        return view["ranking"][:limit]
+    return _prepare_ranking(await _uex_get("commodities_ranking"))[:limit]
+
+# --- Commodity catalog (loaded once, refreshed on a TTL, searched from memory) ---
+COMMODITY_CATALOG_TTL = int(os.getenv("COMMODITY_CATALOG_TTL", "3600"))
+
+_commodity_catalog = {
+    "items": [],        # raw UEX commodity rows
+    "norm": [],         # (normalized name, normalized code) per item, same order as items
+    "prefix": [],       # sorted (normalized key, item index) over names and codes
+}
+
+def _build_commodity_catalog(items: list[dict]):
+    norm = []
+    prefix = []
+    for idx, item in enumerate(items):
+        name_key = _normalize_sc_name(str(item.get("name", "")))
+        code_key = _normalize_sc_name(str(item.get("code", "")))
+        norm.append((name_key, code_key))
+        if name_key:
+            prefix.append((name_key, idx))
+        if code_key and code_key != name_key:
+            prefix.append((code_key, idx))
+    prefix.sort()
+
+    _commodity_catalog["items"] = items
+    _commodity_catalog["norm"] = norm
+    _commodity_catalog["prefix"] = prefix
+    print(f"[UEX] commodity catalog loaded: {len(items)}")
+
+async def _load_commodities():
+    data = await _uex_get("commodities", snapshot=lambda: _commodities_dataset.data)
     if not isinstance(data, list):
-        return []
+        return None
+    return [c for c in data if isinstance(c, dict)]
 
+_commodities_dataset = RefreshableDataset(
+    "UEX commodities", _load_commodities, COMMODITY_CATALOG_TTL, on_load=_build_commodity_catalog
+)
+
+def search_commodity_local(query: str) -> list[dict]:
+    """Exact name/code matches if any, else prefix matches followed by substring matches."""
+    items = _commodity_catalog["items"]
     q = _normalize_sc_name(query)
-    if not q:
+    if not q or not items:
         return []
 
-    exact = []
-    partial = []
+    norm = _commodity_catalog["norm"]
+    exact = [items[i] for i, (name_key, code_key) in enumerate(norm) if q == name_key or q == code_key]
+    if exact:
+        return exact
 
-    for item in data:
-        name = str(item.get("name", ""))
-        code = str(item.get("code", ""))
-        hay = _normalize_sc_name(name)
-        hay_code = _normalize_sc_name(code)
+    prefix = _commodity_catalog["prefix"]
+    seen = set()
+    partial = []
 
-        if q == hay or q == hay_code:
-            exact.append(item)
-        elif q in hay or q in hay_code:
-            partial.append(item)
+    i = bisect.bisect_left(prefix, (q,))
+    while i < len(prefix) and prefix[i][0].startswith(q):
+        idx = prefix[i][1]
+        if idx not in seen:
+            seen.add(idx)
+            partial.append(items[idx])
+        i += 1
 
-    if exact:
-        return exact
+    for idx, (name_key, code_key) in enumerate(norm):
+        if idx not in seen and (q in name_key or q in code_key):
+            seen.add(idx)
+            partial.append(items[idx])
 
     return partial
 
+async def search_commodity_uex(query: str) -> list[dict]:
+    await _commodities_dataset.get()
+    return search_commodity_local(query)
+
 async def commodity_autocomplete(
     interaction: discord.Interaction,
     current: str
@@ -1855,7 +3256,9 @@ async def commodity_autocomplete(
         return []
 
     try:
-        matches = await search_commodity_uex(current)
+        # autocomplete must answer within Discord's 3s window: never wait on UEX here
+        _commodities_dataset.peek()
+        matches = search_commodity_local(current)
     except Exception as e:
         print(f"[ERROR] commodity_autocomplete failed: {e}")
         return []
@@ -1887,8 +3290,59 @@ async def commodity_autocomplete(
 
     return choices
 
+# --- Price matrix (every commodity x terminal price from one bulk pull) ---
+PRICE_MATRIX_TTL = int(os.getenv("PRICE_MATRIX_TTL", "600"))
+PRICE_MATRIX_MAX_AGE = int(os.getenv("PRICE_MATRIX_MAX_AGE", "3600"))
+
+_price_matrix = {
+    "by_commodity": {},  # str(id_commodity) -> price rows
+    "by_terminal": {},   # str(id_terminal) -> price rows
+}
+
+def _build_price_matrix(rows: list[dict]):
+    by_commodity = {}
+    by_terminal = {}
+    for row in rows:
+        commodity_id = row.get("id_commodity")
+        terminal_id = row.get("id_terminal")
+        if commodity_id is not None:
+            by_commodity.setdefault(str(commodity_id), []).append(row)
+        if terminal_id is not None:
+            by_terminal.setdefault(str(terminal_id), []).append(row)
+
+    _price_matrix["by_commodity"] = by_commodity
+    _price_matrix["by_terminal"] = by_terminal
+    print(f"[PRICES] matrix loaded: {len(rows)} prices, {len(by_commodity)} commodities, {len(by_terminal)} terminals")
+
+async def _load_price_matrix():
+    data = await _uex_get(
+        "commodities_prices_all", fields=UEX_PRICE_FIELDS, snapshot=lambda: _price_matrix_dataset.data
+    )
+    return data if isinstance(data, list) else None
+
+_price_matrix_dataset = RefreshableDataset(
+    "PRICES",
+    _load_price_matrix,
+    ttl=PRICE_MATRIX_TTL,
+    on_load=_build_price_matrix,
+    min_backoff=60,
+)
+
+def price_matrix_ready() -> bool:
+    """True when the bulk price matrix is loaded and recent enough to answer from."""
+    return bool(_price_matrix_dataset.peek()) and (
+        time.monotonic() - _price_matrix_dataset.loaded_at <= PRICE_MATRIX_MAX_AGE
+    )
+
 async def get_commodity_prices(commodity_id: str | int):
-    return await _uex_get("commodities_prices", params={"id_commodity": commodity_id})
+    if price_matrix_ready():
+        return list(_price_matrix["by_commodity"].get(str(commodity_id), []))
+    return await _uex_get("commodities_prices", params={"id_commodity": commodity_id}, fields=UEX_PRICE_FIELDS)
+
+async def get_terminal_prices(terminal_id: str | int):
+    if price_matrix_ready():
+        return list(_price_matrix["by_terminal"].get(str(terminal_id), []))
+    return await _uex_get("commodities_prices", params={"id_terminal": terminal_id}, fields=UEX_PRICE_FIELDS)
 
 async def get_commodity_routes(commodity_id: str | int, max_rows: int = 10):
     data = await _uex_get(
@@ -1902,25 +3356,65 @@ async def get_commodity_routes(commodity_id: str | int, max_rows: int = 10):
         return []
     return data
 
-_terminal_cache = None
+TERMINAL_CACHE_TTL = int(os.getenv("TERMINAL_CACHE_TTL", "21600"))
+
+# normalized terminal name -> terminal, built once per terminal list
+_terminal_index = {"source": None, "by_name": {}, "fuzzy": None, "fuzzy_terminals": []}
 
-async def get_all_terminals():
-    global _terminal_cache
+def _auto_load_flag(value) -> bool | None:
+    if value in (1, "1", True):
+        return True
+    if value in (0, "0", False):
+        return False
+    return None
+
+def _index_terminals(terminals: list[dict]):
+    """Precompute system name / auto-load per terminal and a normalized-name lookup table."""
+    by_name = {}
+    for t in terminals:
+        t["_system_name"] = (
+            t.get("star_system_name")
+            or t.get("system_name")
+            or t.get("name_star_system")
+            or "Unknown"
+        )
+        t["_auto_load"] = _auto_load_flag(t.get("is_auto_load"))
+        by_name.setdefault(_normalize_sc_name(t.get("name", "")), t)
 
-    if _terminal_cache is not None:
-        return _terminal_cache
+    _terminal_index["source"] = terminals
+    _terminal_index["by_name"] = by_name
+    _terminal_index["fuzzy"], _terminal_index["fuzzy_terminals"] = _terminal_fuzzy_index(terminals)
 
-    data = await _uex_get("terminals")
+def _terminal_fuzzy_index(terminals: list[dict]) -> tuple[FuzzyIndex, list[dict]]:
+    """Fuzzy index over terminal names, codes and system names; each string maps to its first terminal."""
+    choice_to_terminal = {}
+    for t in terminals:
+        for key in ("name", "code", "star_system_name", "system_name", "name_star_system"):
+            n = str(t.get(key, "") or "").strip()
+            if n:
+                choice_to_terminal.setdefault(n, t)
+    return FuzzyIndex(list(choice_to_terminal)), list(choice_to_terminal.values())
+
+async def _load_terminals():
+    data = await _uex_get("terminals", fields=UEX_TERMINAL_FIELDS, snapshot=lambda: _terminals_dataset.data)
     if not isinstance(data, list):
-        _terminal_cache = []
-        return _terminal_cache
+        return None
+    # after a 304 the rows are the dataset's own TerminalRecords
+    return [t for t in data if isinstance(t, (dict, TerminalRecord))]
+
+_terminals_dataset = RefreshableDataset(
+    "UEX terminals", _load_terminals, TERMINAL_CACHE_TTL, on_load=_index_terminals, record_type=TerminalRecord
+)
 
-    _terminal_cache = data
-    return _terminal_cache
+async def get_all_terminals():
+    return await _terminals_dataset.get()
 
 def find_terminal_info(terminals: list[dict], terminal_name: str):
     norm = _normalize_sc_name(terminal_name)
 
+    if terminals is _terminal_index["source"]:
+        return _terminal_index["by_name"].get(norm)
+
     for t in terminals:
         name = t.get("name", "")
         if _normalize_sc_name(name) == norm:
@@ -1931,6 +3425,8 @@ def find_terminal_info(terminals: list[dict], terminal_name: str):
 def terminal_system_name(terminal_info: dict | None) -> str:
     if not terminal_info:
         return "Unknown"
+    if "_system_name" in terminal_info:
+        return terminal_info["_system_name"]
     return (
         terminal_info.get("star_system_name")
         or terminal_info.get("system_name")
@@ -1938,54 +3434,106 @@ def terminal_system_name(terminal_info: dict | None) -> str:
         or "Unknown"
     )
 
+def terminal_auto_load(terminal_info: dict | None) -> bool | None:
+    if not terminal_info:
+        return None
+    if "_auto_load" in terminal_info:
+        return terminal_info["_auto_load"]
+    return _auto_load_flag(terminal_info.get("is_auto_load"))
+
 SCWIKI_VEHICLES_URL = "https://api.star-citizen.wiki/api/shipmatrix/vehicles"
 
-_ship_cache = None
-_scapi_ship_cache = None
+SHIP_CACHE_TTL = int(os.getenv("SHIP_CACHE_TTL", "43200"))
+# a ship list missing pages is only kept this long before the next reload
+SHIP_PARTIAL_TTL = int(os.getenv("SHIP_PARTIAL_TTL", "600"))
 
-async def get_all_ships_scwiki():
-    global _ship_cache
+SCWIKI_PAGE_CONCURRENCY = int(os.getenv("SCWIKI_PAGE_CONCURRENCY", "4"))
+SCWIKI_PAGE_RETRIES = int(os.getenv("SCWIKI_PAGE_RETRIES", "3"))
+
+async def _fetch_scwiki_page(page_number: int, retries: int = SCWIKI_PAGE_RETRIES) -> tuple[list[dict] | None, dict]:
+    """One ship-matrix page as (ships, other top-level keys); ships is None if the page failed."""
+    for attempt in range(retries):
+        try:
+            async with _client_uex.stream(
+                "GET",
+                SCWIKI_VEHICLES_URL,
+                params={"page[number]": page_number}
+            ) as r:
+                if r.status_code == 200:
+                    page_data, extras = await stream_json_records(r, SCWIKI_SHIP_FIELDS)
+                    if not isinstance(page_data, list):
+                        page_data = []
+                    return [s for s in page_data if isinstance(s, dict)], extras
+
+                await r.aread()
+
+            print(f"[SCWIKI] {r.status_code} {SCWIKI_VEHICLES_URL} page {page_number} try {attempt+1}/{retries} :: {r.text[:300]}")
+
+            if r.status_code not in (429, 500, 502, 503, 504):
+                return None, {}
+
+        except Exception as e:
+            print(f"[SCWIKI] exception page {page_number} try {attempt+1}/{retries} :: {e}")
+
+        await asyncio.sleep(1.2 + attempt)
+
+    return None, {}
+
+_scwiki_load = {"missing_pages": []}   # pages the last ship-matrix load could not fetch
 
-    if _ship_cache is not None:
-        return _ship_cache
+def _ships_snapshot_ttl(ships: list) -> float:
+    return SHIP_PARTIAL_TTL if _scwiki_load["missing_pages"] else SHIP_CACHE_TTL
 
+async def _load_ships_scwiki():
     try:
-        all_ships = []
-        page_number = 1
-        last_page = 1
+        first_page, extras = await _fetch_scwiki_page(1)
+        if first_page is None:
+            return None
 
-        while page_number <= last_page:
-            r = await _client_uex.get(
-                SCWIKI_VEHICLES_URL,
-                params={"page[number]": page_number}
-            )
+        if extras:
+            meta = extras.get("meta", {}) or {}
+            last_page = int(meta.get("last_page", 1) or 1)
+        else:
+            # bare list payload: no pagination
+            last_page = 1
 
-            if r.status_code != 200:
-                print(f"[SCWIKI] {r.status_code} {SCWIKI_VEHICLES_URL} page {page_number} :: {r.text[:300]}")
-                break
+        # Remaining pages in parallel (bounded). Pages that still fail after their
+        # retries get one more sequential pass; if any are still missing, the pages
+        # that did load are kept but only for SHIP_PARTIAL_TTL.
+        sem = asyncio.Semaphore(SCWIKI_PAGE_CONCURRENCY)
 
-            payload = r.json()
+        async def fetch_page(page_number: int):
+            async with sem:
+                page_data, _extras = await _fetch_scwiki_page(page_number)
+                return page_number, page_data
 
-            if isinstance(payload, dict):
-                page_data = payload.get("data", []) or []
-                meta = payload.get("meta", {}) or {}
-                last_page = int(meta.get("last_page", last_page) or last_page)
-            elif isinstance(payload, list):
-                page_data = payload
-                meta = {}
-                last_page = page_number
-            else:
-                page_data = []
-                meta = {}
-                last_page = page_number
+        pages = {1: first_page}
+        failed = []
 
-            if not isinstance(page_data, list):
-                page_data = []
+        for page_number, page_data in await asyncio.gather(
+            *(fetch_page(n) for n in range(2, last_page + 1))
+        ):
+            if page_data is None:
+                failed.append(page_number)
+            else:
+                pages[page_number] = page_data
+
+        if failed:
+            print(f"[SCWIKI] {len(failed)}/{last_page} pages failed, retrying: {failed}")
+            still_failed = []
+            for page_number in failed:
+                page_data, _extras = await _fetch_scwiki_page(page_number)
+                if page_data is None:
+                    still_failed.append(page_number)
+                else:
+                    pages[page_number] = page_data
+            failed = still_failed
 
-            page_data = [s for s in page_data if isinstance(s, dict)]
-            all_ships.extend(page_data)
+        _scwiki_load["missing_pages"] = failed
+        if failed:
+            print(f"[SCWIKI] {len(failed)}/{last_page} pages still missing, keeping the rest for {SHIP_PARTIAL_TTL}s: {failed}")
 
-            page_number += 1
+        all_ships = [ship for n in sorted(pages) for ship in pages[n]]
 
         # de-dupe by id/uuid/slug
         deduped = []
@@ -2004,29 +3552,20 @@ async def get_all_ships_scwiki():
             seen.add(sid)
             deduped.append(ship)
 
-        _ship_cache = deduped
-
-        print(f"[SCWIKI] loaded ships: {len(_ship_cache)}")
-        if _ship_cache:
-            print("[SCWIKI] sample ship keys:", list(_ship_cache[0].keys()))
+        print(f"[SCWIKI] loaded ships: {len(deduped)}")
+        if deduped:
+            print("[SCWIKI] sample ship keys:", list(deduped[0].keys()))
 
-        return _ship_cache
+        return deduped
 
     except Exception as e:
         print(f"[SCWIKI] exception loading ships :: {e}")
-        _ship_cache = []
-        return _ship_cache
-
-async def get_all_scapi_ships():
-    global _scapi_ship_cache
-
-    if _scapi_ship_cache is not None:
-        return _scapi_ship_cache
+        return None
 
+async def _load_scapi_ships():
     if not STARCITIZEN_API_KEY:
         print("[SCAPI] Missing API key")
-        _scapi_ship_cache = []
-        return _scapi_ship_cache
+        return None
 
     url = f"{SCAPI_BASE}/{STARCITIZEN_API_KEY}/v1/{SCAPI_MODE}/ships"
 
@@ -2040,8 +3579,7 @@ async def get_all_scapi_ships():
 
         if r.status_code != 200:
             print(f"[SCAPI] body: {r.text[:500]}")
-            _scapi_ship_cache = []
-            return _scapi_ship_cache
+            return None
 
         payload = r.json()
 
@@ -2049,19 +3587,47 @@ async def get_all_scapi_ships():
 
         if not isinstance(data, list):
             print("[SCAPI] unexpected payload shape")
-            _scapi_ship_cache = []
-            return _scapi_ship_cache
-
-        _scapi_ship_cache = data
+            return None
 
-        print(f"[SCAPI] cached {len(_scapi_ship_cache)} ships")
+        print(f"[SCAPI] cached {len(data)} ships")
 
-        return _scapi_ship_cache
+        return data
 
     except Exception as e:
         print(f"[SCAPI] failed loading ship cache: {e}")
-        _scapi_ship_cache = []
-        return _scapi_ship_cache
+        return None
+
+# on_load is resolved lazily: the ship index helpers are defined further down.
+_ships_dataset = RefreshableDataset(
+    "SCWIKI ships",
+    _load_ships_scwiki,
+    SHIP_CACHE_TTL,
+    on_load=lambda ships: _build_ship_index(ships),
+    record_type=ShipRecord,
+    ttl_for=_ships_snapshot_ttl,
+)
+_scapi_ship_fuzzy = {"source": None, "index": None, "ships": []}
+
+def _index_scapi_ships(ships: list[dict]):
+    """Fuzzy index over SCAPI ship names (last ship wins for a repeated name)."""
+    by_name = {}
+    for ship in ships:
+        name = str(ship.get("name") or "").strip()
+        if name:
+            by_name[name] = ship
+    _scapi_ship_fuzzy["source"] = ships
+    _scapi_ship_fuzzy["index"] = FuzzyIndex(list(by_name))
+    _scapi_ship_fuzzy["ships"] = list(by_name.values())
+
+_scapi_ships_dataset = RefreshableDataset(
+    "SCAPI ships", _load_scapi_ships, SHIP_CACHE_TTL, on_load=_index_scapi_ships, record_type=ShipRecord
+)
+
+async def get_all_ships_scwiki():
+    return await _ships_dataset.get()
+
+async def get_all_scapi_ships():
+    return await _scapi_ships_dataset.get()
 
 
 def _ship_display_name(ship: dict) -> str:
@@ -2116,6 +3682,123 @@ def ship_text(value, default="—"):
 
     return str(value)
 
+SHIP_FUZZY_CUTOFF = int(os.getenv("SHIP_FUZZY_CUTOFF", "78"))
+
+# Built once per ship list load; positions refer to _ship_index["ships"].
+_ship_index = {
+    "ships": [],        # deduped ships, load order
+    "scu": [],          # _ship_scu per ship, same order
+    "names": [],        # raw name variants per ship, same order
+    "by_norm": {},      # normalized name -> set of positions
+    "norm_keys": [],    # sorted normalized names (bisect prefix lookups)
+    "by_token": {},     # lowercased name token / name part -> set of positions
+    "token_keys": [],   # sorted tokens (bisect prefix lookups)
+    "cargo": set(),     # positions of ships with cargo capacity
+    "fuzzy": None,      # FuzzyIndex over every name variant
+    "fuzzy_pos": [],    # ship position per fuzzy choice
+    "cargo_fuzzy": None,
+    "cargo_fuzzy_pos": [],
+}
+
+def _ship_id(ship: dict) -> str:
+    return str(ship.get("uuid") or ship.get("id") or ship.get("slug") or _ship_display_name(ship))
+
+def _ship_name_variants(ship: dict) -> list[str]:
+    names = (
+        str(ship.get("name", "")).strip(),
+        str(ship.get("game_name", "")).strip(),
+        str(ship.get("slug", "")).strip(),
+        str(ship.get("shipmatrix_name", "")).strip(),
+    )
+    return [n for n in names if n]
+
+def _build_ship_index(ships: list[dict]):
+    indexed = []
+    scu = []
+    names = []
+    by_norm = {}
+    by_token = {}
+    cargo = set()
+    seen = set()
+
+    for ship in ships:
+        sid = _ship_id(ship)
+        if sid in seen:
+            continue
+        seen.add(sid)
+
+        pos = len(indexed)
+        indexed.append(ship)
+        ship_scu = _ship_scu(ship)
+        scu.append(ship_scu)
+        if ship_scu > 0:
+            cargo.add(pos)
+
+        variants = _ship_name_variants(ship)
+        names.append(variants)
+
+        for name in variants:
+            norm = _normalize_sc_name(name)
+            if norm:
+                by_norm.setdefault(norm, set()).add(pos)
+
+            lowered = name.lower()
+            tokens = set(lowered.split())
+            tokens.update(p for p in re.split(r"[\s\-_\/]+", lowered) if p)
+            for token in tokens:
+                by_token.setdefault(token, set()).add(pos)
+
+    _ship_index["ships"] = indexed
+    _ship_index["scu"] = scu
+    _ship_index["names"] = names
+    _ship_index["by_norm"] = by_norm
+    _ship_index["norm_keys"] = sorted(by_norm)
+    _ship_index["by_token"] = by_token
+    _ship_index["token_keys"] = sorted(by_token)
+    _ship_index["cargo"] = cargo
+
+    for prefix, positions in (("", range(len(indexed))), ("cargo_", sorted(cargo))):
+        choices = []
+        choice_pos = []
+        for pos in positions:
+            for name in names[pos]:
+                choices.append(name)
+                choice_pos.append(pos)
+        _ship_index[prefix + "fuzzy"] = FuzzyIndex(choices)
+        _ship_index[prefix + "fuzzy_pos"] = choice_pos
+
+    print(f"[SHIPS] index built: {len(indexed)} ships, {len(cargo)} with cargo, {len(by_token)} tokens")
+
+def _ship_prefix_positions(keys: list[str], mapping: dict, prefix: str) -> set[int]:
+    found = set()
+    i = bisect.bisect_left(keys, prefix)
+    while i < len(keys) and keys[i].startswith(prefix):
+        found |= mapping[keys[i]]
+        i += 1
+    return found
+
+def _ship_substring_positions(q_norm: str) -> set[int]:
+    by_norm = _ship_index["by_norm"]
+    found = set()
+    for key in _ship_index["norm_keys"]:
+        if q_norm in key:
+            found |= by_norm[key]
+    return found
+
+def _ship_fuzzy_positions(raw_query: str, cargo_only: bool = False, limit: int = 25) -> list[int]:
+    prefix = "cargo_" if cargo_only else ""
+    fuzzy_index = _ship_index[prefix + "fuzzy"]
+    if fuzzy_index is None:
+        return []
+
+    choice_pos = _ship_index[prefix + "fuzzy_pos"]
+    positions = []
+    for idx, _score in fuzzy_index.extract(raw_query, limit=limit, cutoff=SHIP_FUZZY_CUTOFF):
+        pos = choice_pos[idx]
+        if pos not in positions:
+            positions.append(pos)
+    return positions
+
 async def search_ships_scwiki(query: str, cargo_only: bool = False) -> list[dict]:
     ships = await get_all_ships_scwiki()
     if not isinstance(ships, list):
@@ -2126,105 +3809,31 @@ async def search_ships_scwiki(query: str, cargo_only: bool = False) -> list[dict
     if not q_norm:
         return []
 
-    def ship_names(ship: dict) -> list[str]:
-        return [
-            str(ship.get("name", "")).strip(),
-            str(ship.get("game_name", "")).strip(),
-            str(ship.get("slug", "")).strip(),
-            str(ship.get("shipmatrix_name", "")).strip(),
-        ]
-
-    def ship_id(ship: dict) -> str:
-        return str(ship.get("uuid") or ship.get("id") or ship.get("slug") or _ship_display_name(ship))
-
-    def usable(ship: dict) -> bool:
-        return True if not cargo_only else _ship_scu(ship) > 0
-
-    def dedupe(ship_list: list[dict]) -> list[dict]:
-        seen = set()
-        out = []
-        for ship in ship_list:
-            if not usable(ship):
-                continue
-            sid = ship_id(ship)
-            if sid in seen:
-                continue
-            seen.add(sid)
-            out.append(ship)
-        return out
-
-    exact = []
-    token_matches = []
-    partial = []
-
-    for ship in ships:
-        names = ship_names(ship)
-        lowered = [n.lower() for n in names if n]
-        norm_names = [_normalize_sc_name(n) for n in names if n]
-
-        if any(q_norm == n for n in norm_names):
-            exact.append(ship)
-            continue
-
-        if any(n.startswith(q_norm) for n in norm_names):
-            token_matches.append(ship)
-            continue
+    indexed = _ship_index["ships"]
+    allowed = _ship_index["cargo"] if cargo_only else None
 
-        if any(raw_query.lower() in n.split() for n in lowered):
-            token_matches.append(ship)
-            continue
-
-        if any(part.startswith(raw_query.lower()) for n in lowered for part in re.split(r"[\s\-_\/]+", n) if part):
-            token_matches.append(ship)
-            continue
-
-        if any(q_norm in n for n in norm_names):
-            partial.append(ship)
+    def pick(positions) -> list[dict]:
+        if allowed is not None:
+            positions = set(positions) & allowed
+        return [indexed[pos] for pos in sorted(positions)][:25]
 
-    exact = dedupe(exact)
+    exact = pick(_ship_index["by_norm"].get(q_norm, ()))
     if exact:
-        return exact[:25]
+        return exact
 
-    token_matches = dedupe(token_matches)
+    token_matches = pick(
+        _ship_prefix_positions(_ship_index["norm_keys"], _ship_index["by_norm"], q_norm)
+        | _ship_prefix_positions(_ship_index["token_keys"], _ship_index["by_token"], raw_query.lower())
+    )
     if token_matches:
-        return token_matches[:25]
+        return token_matches
 
-    partial = dedupe(partial)
+    partial = pick(_ship_substring_positions(q_norm))
     if partial:
-        return partial[:25]
-
-    choices = []
-    choice_to_ship = {}
-
-    for ship in ships:
-        if not usable(ship):
-            continue
-
-        for name in ship_names(ship):
-            if not name:
-                continue
-            choices.append(name)
-            choice_to_ship[name] = ship
-
-    fuzzy = process.extract(raw_query, choices, scorer=fuzz.token_sort_ratio, limit=25)
-
-    results = []
-    seen = set()
-
-    for matched_name, score in fuzzy:
-        if score < 78:
-            continue
-
-        ship = choice_to_ship[matched_name]
-        sid = ship_id(ship)
-
-        if sid in seen:
-            continue
+        return partial
 
-        seen.add(sid)
-        results.append(ship)
+    return [indexed[pos] for pos in _ship_fuzzy_positions(raw_query, cargo_only)][:25]
 
-    return results[:25]
 async def ship_autocomplete(
     interaction: discord.Interaction,
     current: str
@@ -2232,65 +3841,23 @@ async def ship_autocomplete(
     if not current or not current.strip():
         return []
 
-    global _ship_cache
-    ships = _ship_cache or []
-
-    if not ships:
+    if not _ships_dataset.peek():
         return []
 
     raw_query = current.strip()
     q_norm = _normalize_sc_name(raw_query)
 
-    def ship_names(ship: dict) -> list[str]:
-        return [
-            str(ship.get("name", "")).strip(),
-            str(ship.get("game_name", "")).strip(),
-            str(ship.get("slug", "")).strip(),
-            str(ship.get("shipmatrix_name", "")).strip(),
-        ]
-
-    matches = []
-
-    for ship in ships:
-        names = ship_names(ship)
-        norm_names = [_normalize_sc_name(n) for n in names if n]
-
-        if any(q_norm == n for n in norm_names) or any(q_norm in n for n in norm_names):
-            matches.append(ship)
-
-    if not matches:
-        choices_pool = []
-        choice_to_ship = {}
-
-        for ship in ships:
-            for n in ship_names(ship):
-                if not n:
-                    continue
-                choices_pool.append(n)
-                choice_to_ship[n] = ship
-
-        fuzzy_matches = process.extract(raw_query, choices_pool, scorer=fuzz.token_sort_ratio, limit=25)
-
-        seen = set()
-        for matched_name, score in fuzzy_matches:
-            if score < 78:
-                continue
-
-            ship = choice_to_ship[matched_name]
-            sid = str(ship.get("uuid") or ship.get("id") or ship.get("slug") or _ship_display_name(ship))
-
-            if sid in seen:
-                continue
-
-            seen.add(sid)
-            matches.append(ship)
+    positions = sorted(_ship_substring_positions(q_norm)) if q_norm else []
+    if not positions:
+        positions = _ship_fuzzy_positions(raw_query)
 
     choices = []
     seen_names = set()
 
-    for ship in matches[:25]:
+    for pos in positions[:25]:
+        ship = _ship_index["ships"][pos]
         ship_name = _ship_display_name(ship)
-        ship_scu = _ship_scu(ship)
+        ship_scu = _ship_index["scu"][pos]
 
         if not ship_name:
             continue
@@ -2413,37 +3980,28 @@ async def fetch_ship_from_scapi(ship_name: str) -> dict | None:
         return partial[0]
 
     # fuzzy fallback
-    choices = {}
-    choice_names = []
-
-    for ship in ships:
-        name = str(ship.get("name") or "").strip()
-
-        if not name:
-            continue
-
-        choice_names.append(name)
-        choices[name] = ship
+    if ships is not _scapi_ship_fuzzy["source"]:
+        _index_scapi_ships(ships)
 
-    fuzzy = process.extractOne(
-        ship_name,
-        choice_names,
-        scorer=fuzz.token_sort_ratio
-    )
+    fuzzy = _scapi_ship_fuzzy["index"].extract_one(ship_name)
 
     if fuzzy:
-        matched_name, score = fuzzy
+        idx, score = fuzzy
+        matched_name = _scapi_ship_fuzzy["index"].choices[idx]
 
         print(f"[SCAPI] fuzzy match {matched_name} ({score})")
 
         if score >= 70:
-            return choices[matched_name]
+            return _scapi_ship_fuzzy["ships"][idx]
 
     print(f"[SCAPI] no ship found for {ship_name}")
 
     return None
     
 def build_ship_embed(ship: dict) -> discord.Embed:
+    # The embed reads many fields beyond the projected ones; decode the full payload once.
+    ship = as_plain_dict(ship)
+
     ship_name = ship_text(
         ship.get("name")
         or ship.get("game_name")
@@ -2737,16 +4295,7 @@ async def build_commodity_embed(
     wanted_system = (system_filter or "").strip().lower()
 
     def is_terminal_auto_load(terminal_name: str) -> bool | None:
-        terminal_info = find_terminal_info(terminals, terminal_name)
-        if not terminal_info:
-            return None
-
-        val = terminal_info.get("is_auto_load")
-        if val in (1, "1", True):
-            return True
-        if val in (0, "0", False):
-            return False
-        return None
+        return terminal_auto_load(find_terminal_info(terminals, terminal_name))
 
     def terminal_matches_system(terminal_name: str) -> bool:
         if not wanted_system:
@@ -2872,20 +4421,23 @@ async def build_route_embed(
     commodity_id = commodity.get("id") or commodity.get("id_commodity")
     commodity_name = commodity.get("name", "Unknown Commodity")
 
-    routes = await get_commodity_routes(commodity_id, max_rows=25)
     terminals = await get_all_terminals()
     wanted_system = (system_filter or "").strip().lower()
 
+    # Prefer routes computed locally from the full price matrix (so filters see every
+    # terminal, not just UEX's top 25); fall back to the UEX routes endpoint.
+    routes = local_commodity_routes(
+        commodity_id,
+        terminals,
+        cargo_scu=cargo_scu,
+        auto_load_only=auto_load_only,
+        system_filter=system_filter,
+    )
+    if routes is None:
+        routes = await get_commodity_routes(commodity_id, max_rows=25)
+
     def is_terminal_auto_load(terminal_name: str) -> bool | None:
-        terminal_info = find_terminal_info(terminals, terminal_name)
-        if not terminal_info:
-            return None
-        val = terminal_info.get("is_auto_load")
-        if val in (1, "1", True):
-            return True
-        if val in (0, "0", False):
-            return False
-        return None
+        return terminal_auto_load(find_terminal_info(terminals, terminal_name))
 
     embed = discord.Embed(
         title=f"📈 Best Routes — {commodity_name}",
@@ -3343,7 +4895,7 @@ class TerminalDropdown(discord.ui.View):
             )
             return
 
-        data = await _uex_get("commodities_prices", params={"id_terminal": terminal_id})
+        data = await get_terminal_prices(terminal_id)
 
         if not data:
             await interaction.edit_original_response(
@@ -3384,116 +4936,260 @@ class TerminalDropdown(discord.ui.View):
         except Exception as e:
             print(f"[ERROR] Failed to log final terminal dropdown output: {e}")
 
-async def build_bestnow_embed(
-    auto_load_only: bool = False,
-    system_filter: str | None = None,
-    cargo_scu: int | None = None,
-    ship_name: str | None = None
-) -> discord.Embed:
-    ranked = await _uex_get("commodities_ranking")
-    terminals = await get_all_terminals()
-    wanted_system = (system_filter or "").strip().lower()
+BESTNOW_SCAN_CONCURRENCY = int(os.getenv("BESTNOW_SCAN_CONCURRENCY", "8"))
+BESTNOW_ENOUGH_COMMODITIES = int(os.getenv("BESTNOW_ENOUGH_COMMODITIES", "25"))
+BESTNOW_SCAN_TIMEOUT = float(os.getenv("BESTNOW_SCAN_TIMEOUT", "12"))
 
-    def is_terminal_auto_load(terminal_name: str) -> bool | None:
-        terminal_info = find_terminal_info(terminals, terminal_name)
-        if not terminal_info:
-            return None
-        val = terminal_info.get("is_auto_load")
-        if val in (1, "1", True):
-            return True
-        if val in (0, "0", False):
-            return False
+def _route_terminal_names(r: dict) -> tuple[str, str]:
+    origin = (
+        r.get("terminal_origin_name")
+        or r.get("origin_terminal_name")
+        or r.get("from_terminal_name")
+        or "Unknown Origin"
+    )
+    destination = (
+        r.get("terminal_destination_name")
+        or r.get("destination_terminal_name")
+        or r.get("to_terminal_name")
+        or "Unknown Destination"
+    )
+    return origin, destination
+
+def _trade_candidate(commodity: dict, r: dict, terminals: list[dict]) -> dict | None:
+    """One UEX route enriched with terminal system / auto-load info; None if unprofitable."""
+    profit = float(r.get("profit") or r.get("profit_total") or 0)
+    if profit <= 0:
         return None
 
-    def auto_icon(value):
-        if value is True:
-            return "✅"
-        if value is False:
-            return "❌"
-        return "❔"
+    origin, destination = _route_terminal_names(r)
+    origin_info = find_terminal_info(terminals, origin)
+    destination_info = find_terminal_info(terminals, destination)
 
-    embed = discord.Embed(
-        title="💰 Best Trade Right Now",
-        color=0x2ECC71
-    )
+    return {
+        "commodity": (
+            commodity.get("name")
+            or r.get("commodity_name")
+            or r.get("name_commodity")
+            or "Unknown Commodity"
+        ),
+        "origin": origin,
+        "destination": destination,
+        "origin_system": terminal_system_name(origin_info),
+        "destination_system": terminal_system_name(destination_info),
+        "origin_auto": terminal_auto_load(origin_info),
+        "destination_auto": terminal_auto_load(destination_info),
+        "profit": profit,
+    }
 
-    if not isinstance(ranked, list) or not ranked:
-        embed.description = "No commodity ranking data found."
-        embed.set_footer(text="Star Citizen — UEX")
-        return embed
+def _candidate_matches(c: dict, wanted_system: str, auto_load_only: bool) -> bool:
+    if auto_load_only and not (c["origin_auto"] is True and c["destination_auto"] is True):
+        return False
+    if wanted_system and not (
+        c["origin_system"].lower() == wanted_system
+        and c["destination_system"].lower() == wanted_system
+    ):
+        return False
+    return True
+
+async def _scan_commodity_routes(
+    commodities: list[dict],
+    on_routes,
+    max_rows: int = 10,
+    timeout: float = BESTNOW_SCAN_TIMEOUT,
+    should_stop=None,
+) -> int:
+    """
+    Fetch routes for the given commodities in parallel (bounded), calling
+    on_routes(commodity, routes) as each result lands. Stops early once
+    should_stop(with_routes) is true or the time budget runs out.
+    Returns how many commodities reported routes.
+    """
+    sem = asyncio.Semaphore(BESTNOW_SCAN_CONCURRENCY)
 
-    # Try top ranked commodities first, then find their best route.
-    ranked = sorted(
-        ranked,
-        key=lambda x: float(x.get("cax_score") or 0),
-        reverse=True
-    )[:40]
+    async def fetch_routes(commodity: dict):
+        async with sem:
+            commodity_id = commodity.get("id") or commodity.get("id_commodity")
+            return commodity, await get_commodity_routes(commodity_id, max_rows=max_rows)
 
-    best = None
+    tasks = [
+        asyncio.create_task(fetch_routes(c))
+        for c in commodities
+        if c.get("id") or c.get("id_commodity")
+    ]
+    with_routes = 0
 
-    for commodity in ranked:
-        commodity_id = commodity.get("id") or commodity.get("id_commodity")
-        if not commodity_id:
-            continue
+    try:
+        for next_done in asyncio.as_completed(tasks, timeout=timeout):
+            try:
+                commodity, routes = await next_done
+            except asyncio.TimeoutError:
+                raise
+            except Exception as e:
+                print(f"[UEX] route fetch failed: {e}")
+                continue
 
-        routes = await get_commodity_routes(commodity_id, max_rows=10)
-        if not routes:
-            continue
+            if not routes:
+                continue
 
-        for r in routes:
-            origin = (
-                r.get("terminal_origin_name")
-                or r.get("origin_terminal_name")
-                or r.get("from_terminal_name")
-                or "Unknown Origin"
-            )
-            destination = (
-                r.get("terminal_destination_name")
-                or r.get("destination_terminal_name")
-                or r.get("to_terminal_name")
-                or "Unknown Destination"
-            )
+            on_routes(commodity, routes)
+            with_routes += 1
 
-            origin_info = find_terminal_info(terminals, origin)
-            destination_info = find_terminal_info(terminals, destination)
+            if should_stop and should_stop(with_routes):
+                break
+    except asyncio.TimeoutError:
+        print(f"[UEX] route scan hit {timeout}s budget after {with_routes} commodities")
+    finally:
+        for t in tasks:
+            t.cancel()
+
+    return with_routes
+
+# --- Best-trade view (ranking + routes precomputed in the background) ---
+TRADE_VIEW_REFRESH_SECONDS = int(os.getenv("TRADE_VIEW_REFRESH_SECONDS", "300"))
+TRADE_VIEW_MAX_AGE = int(os.getenv("TRADE_VIEW_MAX_AGE", "1800"))
+TRADE_VIEW_TOP_COMMODITIES = int(os.getenv("TRADE_VIEW_TOP_COMMODITIES", "40"))
+TRADE_VIEW_ROUTES_PER_COMMODITY = int(os.getenv("TRADE_VIEW_ROUTES_PER_COMMODITY", "25"))
+TRADE_VIEW_SCAN_TIMEOUT = float(os.getenv("TRADE_VIEW_SCAN_TIMEOUT", "90"))
+
+async def _load_trade_view() -> dict | None:
+    """
+    Pull the commodity ranking and the routes of the top commodities, and index the
+    enriched routes by (system, auto-load only) so the trade commands answer from memory.
+    """
+    ranking = _prepare_ranking(await _uex_get("commodities_ranking"))
+    if not ranking:
+        return None
 
-            origin_system = terminal_system_name(origin_info)
-            destination_system = terminal_system_name(destination_info)
+    terminals = await get_all_terminals()
+    routes = []
+
+    def collect(commodity: dict, commodity_routes: list[dict]):
+        for r in commodity_routes:
+            candidate = _trade_candidate(commodity, r, terminals)
+            if candidate:
+                routes.append(candidate)
+
+    scanned = await _scan_commodity_routes(
+        ranking[:TRADE_VIEW_TOP_COMMODITIES],
+        collect,
+        max_rows=TRADE_VIEW_ROUTES_PER_COMMODITY,
+        timeout=TRADE_VIEW_SCAN_TIMEOUT,
+    )
+    routes.sort(key=lambda c: c["profit"], reverse=True)
+
+    # Every route lands under ("", False); in-system routes also under their system,
+    # and routes with auto-load at both ends also under the auto-load-only keys.
+    by_filter: dict[tuple[str, bool], list[dict]] = {}
+    for c in routes:
+        systems = [""]
+        origin_system = c["origin_system"].lower()
+        if origin_system and origin_system == c["destination_system"].lower():
+            systems.append(origin_system)
+
+        auto_flags = [False]
+        if c["origin_auto"] is True and c["destination_auto"] is True:
+            auto_flags.append(True)
+
+        for system in systems:
+            for auto_only in auto_flags:
+                by_filter.setdefault((system, auto_only), []).append(c)
+
+    print(f"[UEX] trade view built: {len(routes)} routes from {scanned} commodities")
+    return {
+        "as_of": datetime.now(timezone.utc),
+        "ranking": ranking,
+        "routes": routes,
+        "by_filter": by_filter,
+    }
 
-            origin_auto = is_terminal_auto_load(origin)
-            destination_auto = is_terminal_auto_load(destination)
+_trade_view_dataset = RefreshableDataset(
+    "TRADEVIEW",
+    _load_trade_view,
+    ttl=TRADE_VIEW_REFRESH_SECONDS,
+    min_backoff=60,
+)
 
-            if auto_load_only and not (origin_auto is True and destination_auto is True):
-                continue
+def get_trade_view() -> dict | None:
+    """The precomputed trade view if it is recent enough to answer from, else None."""
+    view = _trade_view_dataset.peek()
+    if not view or time.monotonic() - _trade_view_dataset.loaded_at > TRADE_VIEW_MAX_AGE:
+        return None
+    return view
 
-            if wanted_system and not (
-                origin_system.lower() == wanted_system
-                and destination_system.lower() == wanted_system
-            ):
-                continue
+def trade_view_best(wanted_system: str, auto_load_only: bool) -> tuple[dict | None, datetime] | None:
+    """Best route for the filters from the view, with its as-of time; None when there is no view."""
+    view = get_trade_view()
+    if view is None:
+        return None
+    matches = view["by_filter"].get((wanted_system, auto_load_only)) or []
+    return (matches[0] if matches else None), view["as_of"]
+
+def set_data_as_of(embed: discord.Embed, footer_bits: list[str], as_of: datetime | None):
+    if as_of is None:
+        return
+    embed.timestamp = as_of
+    footer_bits.append(f"Data as of {as_of.strftime('%H:%M UTC')}")
+
+
+async def build_bestnow_embed(
+    auto_load_only: bool = False,
+    system_filter: str | None = None,
+    cargo_scu: int | None = None,
+    ship_name: str | None = None
+) -> discord.Embed:
+    wanted_system = (system_filter or "").strip().lower()
+
+    def auto_icon(value):
+        if value is True:
+            return "✅"
+        if value is False:
+            return "❌"
+        return "❔"
 
-            profit = float(r.get("profit") or r.get("profit_total") or 0)
-            if profit <= 0:
-                continue
+    embed = discord.Embed(
+        title="💰 Best Trade Right Now",
+        color=0x2ECC71
+    )
 
-            candidate = {
-                "commodity": (
-                    commodity.get("name")
-                    or r.get("commodity_name")
-                    or r.get("name_commodity")
-                    or "Unknown Commodity"
-                ),
-                "origin": origin,
-                "destination": destination,
-                "origin_system": origin_system,
-                "destination_system": destination_system,
-                "origin_auto": origin_auto,
-                "destination_auto": destination_auto,
-                "profit": profit,
-            }
+    as_of = None
+    from_view = trade_view_best(wanted_system, auto_load_only)
 
-            if best is None or candidate["profit"] > best["profit"]:
-                best = candidate
+    if from_view is not None:
+        best, as_of = from_view
+    else:
+        ranked = await _uex_get("commodities_ranking")
+        terminals = await get_all_terminals()
+
+        if not isinstance(ranked, list) or not ranked:
+            embed.description = "No commodity ranking data found."
+            embed.set_footer(text="Star Citizen — UEX")
+            return embed
+
+        # Try top ranked commodities first, then find their best route.
+        ranked = sorted(
+            ranked,
+            key=lambda x: float(x.get("cax_score") or 0),
+            reverse=True
+        )[:40]
+
+        best = None
+
+        def consider(commodity: dict, routes: list[dict]):
+            nonlocal best
+            for r in routes:
+                candidate = _trade_candidate(commodity, r, terminals)
+                if candidate is None or not _candidate_matches(candidate, wanted_system, auto_load_only):
+                    continue
+                if best is None or candidate["profit"] > best["profit"]:
+                    best = candidate
+
+        # Fold each commodity's routes into the running best as they land; stop once
+        # enough commodities have reported routes or the time budget runs out.
+        await _scan_commodity_routes(
+            ranked,
+            consider,
+            should_stop=lambda n: best is not None and n >= BESTNOW_ENOUGH_COMMODITIES,
+        )
 
     if not best:
         embed.description = "No profitable trade found matching your filters."
@@ -3502,6 +5198,7 @@ async def build_bestnow_embed(
             footer_bits.append("Auto-load only")
         if system_filter:
             footer_bits.append(f"System: {system_filter}")
+        set_data_as_of(embed, footer_bits, as_of)
         embed.set_footer(text=" • ".join(footer_bits))
         return embed
 
@@ -3527,6 +5224,7 @@ async def build_bestnow_embed(
         footer_bits.append("Auto-load only")
     if system_filter:
         footer_bits.append(f"System: {system_filter}")
+    set_data_as_of(embed, footer_bits, as_of)
 
     embed.set_footer(text=" • ".join(footer_bits))
     return embed
@@ -3583,34 +5281,16 @@ async def search_terminal_uex(query: str) -> list[dict]:
         return partial[:25]
 
     # fuzzy fallback
-    choices = []
-    choice_to_terminal = {}
-
-    for terminal in terminals:
-        possible_names = [
-            str(terminal.get("name", "")).strip(),
-            str(terminal.get("code", "")).strip(),
-            str(terminal.get("star_system_name", "")).strip(),
-            str(terminal.get("system_name", "")).strip(),
-            str(terminal.get("name_star_system", "")).strip(),
-        ]
-
-        for n in possible_names:
-            if not n:
-                continue
-            choices.append(n)
-            choice_to_terminal[n] = terminal
-
-    fuzzy_matches = process.extract(raw_query, choices, scorer=fuzz.token_sort_ratio, limit=25)
+    if terminals is _terminal_index["source"] and _terminal_index["fuzzy"] is not None:
+        fuzzy_index, fuzzy_terminals = _terminal_index["fuzzy"], _terminal_index["fuzzy_terminals"]
+    else:
+        fuzzy_index, fuzzy_terminals = _terminal_fuzzy_index(terminals)
 
     results = []
     seen = set()
 
-    for matched_name, score in fuzzy_matches:
-        if score < 75:
-            continue
-
-        terminal = choice_to_terminal[matched_name]
+    for idx, score in fuzzy_index.extract(raw_query, limit=25, cutoff=75):
+        terminal = fuzzy_terminals[idx]
         tid = str(terminal.get("id") or terminal.get("name") or "")
         if tid in seen:
             continue
@@ -3681,6 +5361,309 @@ def _best_sell_row(rows: list[dict]) -> dict | None:
         return None
     return max(sell_rows, key=lambda r: _to_float(r.get("price_sell")))
 
+# A buy or sell location must cover this share of the cargo hold to count.
+CARGO_MIN_STOCK_RATIO = float(os.getenv("CARGO_MIN_STOCK_RATIO", "0.75"))
+
+def _price_row_terminal(row: dict) -> str:
+    return row.get("terminal_name") or row.get("name_terminal") or "Unknown"
+
+def commodity_market(
+    rows: list[dict],
+    terminals: list[dict],
+    min_scu: float = 0,
+    auto_load_only: bool = False,
+) -> tuple[list[dict], list[dict]]:
+    """
+    Split one commodity's price rows into buy and sell points, each enriched with
+    terminal system / auto-load info and filtered by stock (buy) or demand (sell).
+    """
+    buys = []
+    sells = []
+    for row in rows:
+        terminal_name = _price_row_terminal(row)
+        info = find_terminal_info(terminals, terminal_name)
+        auto = terminal_auto_load(info)
+        if auto_load_only and auto is not True:
+            continue
+
+        point = {
+            "terminal": terminal_name,
+            "terminal_id": row.get("id_terminal"),
+            "system": terminal_system_name(info),
+            "auto": auto,
+        }
+
+        price_buy = _to_float(row.get("price_buy"))
+        if price_buy > 0 and _to_float(row.get("scu_buy")) >= min_scu:
+            buys.append({**point, "price": price_buy, "scu": _to_float(row.get("scu_buy"))})
+
+        price_sell = _to_float(row.get("price_sell"))
+        if price_sell > 0 and _to_float(row.get("scu_sell")) >= min_scu:
+            sells.append({**point, "price": price_sell, "scu": _to_float(row.get("scu_sell"))})
+
+    return buys, sells
+
+def local_commodity_routes(
+    commodity_id: str | int,
+    terminals: list[dict],
+    cargo_scu: int | None = None,
+    auto_load_only: bool = False,
+    system_filter: str | None = None,
+    limit: int = 25,
+) -> list[dict] | None:
+    """
+    Best buy->sell routes for one commodity computed from the price matrix, shaped like
+    UEX commodities_routes rows. None when the matrix is not loaded or has no prices
+    for this commodity, so the caller falls back to UEX.
+    """
+    if not price_matrix_ready():
+        return None
+
+    rows = _price_matrix["by_commodity"].get(str(commodity_id))
+    if not rows:
+        return None
+    wanted_system = (system_filter or "").strip().lower()
+    min_scu = cargo_scu * CARGO_MIN_STOCK_RATIO if cargo_scu else 0
+    buys, sells = commodity_market(rows, terminals, min_scu, auto_load_only)
+
+    # Cheapest buys against the highest sells: once a sell no longer beats the buy
+    # price, no later (cheaper) sell will either.
+    buys.sort(key=lambda p: p["price"])
+    sells.sort(key=lambda p: p["price"], reverse=True)
+
+    routes = []
+    for buy in buys:
+        for sell in sells:
+            if sell["price"] <= buy["price"]:
+                break
+            if sell["terminal"] == buy["terminal"]:
+                continue
+            if wanted_system and wanted_system not in (buy["system"].lower(), sell["system"].lower()):
+                continue
+
+            profit = sell["price"] - buy["price"]
+            routes.append({
+                "terminal_origin_name": buy["terminal"],
+                "terminal_destination_name": sell["terminal"],
+                "price_origin": buy["price"],
+                "price_destination": sell["price"],
+                "scu_origin": buy["scu"],
+                "scu_destination": sell["scu"],
+                "profit": round(profit, 2),
+                "profit_margin": f"{profit / buy['price'] * 100:.1f}%",
+            })
+
+    routes.sort(key=lambda r: r["profit"], reverse=True)
+    return routes[:limit]
+
+# --- Multi-leg trade loops (beam search over the price matrix) ---
+TRADE_LOOP_BEAM_WIDTH = int(os.getenv("TRADE_LOOP_BEAM_WIDTH", "200"))
+TRADE_LOOP_BRANCHING = int(os.getenv("TRADE_LOOP_BRANCHING", "15"))
+TRADE_LOOP_TIMEOUT = float(os.getenv("TRADE_LOOP_TIMEOUT", "8"))
+
+def _best_legs_by_pair(
+    by_commodity: dict[str, list[dict]],
+    terminals: list[dict],
+    cargo_scu: int,
+    auto_load_only: bool = False,
+    deadline: float | None = None,
+) -> dict[str, dict[str, dict]]:
+    """
+    origin terminal -> destination terminal -> most profitable full-hold leg between them.
+    Stops early (with the pairs found so far) once `deadline` passes.
+    """
+    min_scu = cargo_scu * CARGO_MIN_STOCK_RATIO
+    pairs = {}
+
+    for rows in by_commodity.values():
+        if deadline is not None and time.monotonic() > deadline:
+            break
+        if not rows:
+            continue
+        buys, sells = commodity_market(rows, terminals, min_scu, auto_load_only)
+        if not buys or not sells:
+            continue
+
+        commodity_name = rows[0].get("commodity_name") or rows[0].get("name_commodity") or "Unknown Commodity"
+        sells.sort(key=lambda p: p["price"], reverse=True)
+
+        for buy in buys:
+            for sell in sells:
+                if sell["price"] <= buy["price"]:
+                    break
+                if sell["terminal"] == buy["terminal"]:
+                    continue
+
+                units = min(cargo_scu, buy["scu"], sell["scu"])
+                profit = (sell["price"] - buy["price"]) * units
+                by_destination = pairs.setdefault(buy["terminal"], {})
+                current = by_destination.get(sell["terminal"])
+                if current is None or profit > current["profit"]:
+                    by_destination[sell["terminal"]] = {
+                        "commodity": commodity_name,
+                        "origin": buy["terminal"],
+                        "origin_system": buy["system"],
+                        "origin_auto": buy["auto"],
+                        "destination": sell["terminal"],
+                        "destination_system": sell["system"],
+                        "destination_auto": sell["auto"],
+                        "buy_price": buy["price"],
+                        "sell_price": sell["price"],
+                        "units": int(units),
+                        "profit": profit,
+                    }
+
+    return pairs
+
+def plan_trade_loops(
+    by_commodity: dict[str, list[dict]],
+    terminals: list[dict],
+    cargo_scu: int,
+    max_legs: int = 3,
+    start_system: str | None = None,
+    auto_load_only: bool = False,
+    limit: int = 3,
+    deadline: float | None = None,
+) -> list[dict]:
+    """
+    Plan closed trade loops of 2..max_legs legs that end back at their starting terminal.
+
+    Beam search: keep the best TRADE_LOOP_BEAM_WIDTH partial paths, extend each with the
+    TRADE_LOOP_BRANCHING most profitable legs from its current terminal, and close a loop
+    whenever there is a profitable leg home. Pure CPU work with no awaits, meant to run in
+    a worker thread; returns the best loops found so far once `deadline` passes.
+    """
+    pairs = _best_legs_by_pair(by_commodity, terminals, cargo_scu, auto_load_only, deadline=deadline)
+    outgoing = {
+        origin: sorted(by_destination.values(), key=lambda leg: leg["profit"], reverse=True)[:TRADE_LOOP_BRANCHING]
+        for origin, by_destination in pairs.items()
+    }
+
+    wanted_system = (start_system or "").strip().lower()
+    beam = [
+        (leg["profit"], (leg,))
+        for legs in outgoing.values()
+        for leg in legs
+        if not wanted_system or leg["origin_system"].lower() == wanted_system
+    ]
+
+    loops = {}
+    for depth in range(1, max_legs):
+        if deadline is not None and time.monotonic() > deadline:
+            break
+
+        beam.sort(key=lambda state: state[0], reverse=True)
+        beam = beam[:TRADE_LOOP_BEAM_WIDTH]
+        next_beam = []
+
+        for total, path in beam:
+            if deadline is not None and time.monotonic() > deadline:
+                break
+            start = path[0]["origin"]
+            current = path[-1]["destination"]
+
+            closing = pairs.get(current, {}).get(start)
+            if closing:
+                loop = path + (closing,)
+                # The same cycle entered from another terminal is the same loop.
+                key = frozenset((leg["origin"], leg["destination"]) for leg in loop)
+                loop_total = total + closing["profit"]
+                if key not in loops or loop_total > loops[key]["total"]:
+                    loops[key] = {"total": loop_total, "legs": list(loop)}
+
+            if depth + 1 < max_legs:
+                visited = {leg["origin"] for leg in path}
+                for leg in outgoing.get(current, []):
+                    if leg["destination"] in visited:
+                        continue
+                    next_beam.append((total + leg["profit"], path + (leg,)))
+
+        beam = next_beam
+
+    return sorted(loops.values(), key=lambda loop: loop["total"], reverse=True)[:limit]
+
+async def find_trade_loops(
+    cargo_scu: int,
+    max_legs: int = 3,
+    start_system: str | None = None,
+    auto_load_only: bool = False,
+) -> list[dict] | None:
+    """Run the loop planner off the event loop. None when there is no price matrix to plan over."""
+    await _price_matrix_dataset.get()
+    if not price_matrix_ready():
+        return None
+
+    terminals = await get_all_terminals()
+    # Snapshot references: a matrix refresh swaps in new dicts rather than mutating these.
+    by_commodity = _price_matrix["by_commodity"]
+    deadline = time.monotonic() + TRADE_LOOP_TIMEOUT
+
+    return await asyncio.wait_for(
+        asyncio.to_thread(
+            plan_trade_loops,
+            by_commodity,
+            terminals,
+            cargo_scu,
+            max_legs=max_legs,
+            start_system=start_system,
+            auto_load_only=auto_load_only,
+            deadline=deadline,
+        ),
+        timeout=TRADE_LOOP_TIMEOUT + 2,
+    )
+
+def build_trade_loop_embed(
+    loops: list[dict],
+    cargo_scu: int,
+    max_legs: int,
+    auto_load_only: bool = False,
+    start_system: str | None = None,
+    ship_name: str | None = None,
+) -> discord.Embed:
+    def auto_icon(value):
+        if value is True:
+            return "✅"
+        if value is False:
+            return "❌"
+        return "❔"
+
+    embed = discord.Embed(
+        title="🔁 Best Trade Loops",
+        description=f"Closed cargo loops of up to {max_legs} legs, ending where they start.",
+        color=0x2ECC71
+    )
+
+    if not loops:
+        embed.description = "No profitable trade loop found matching your filters."
+
+    for idx, loop in enumerate(loops, start=1):
+        lines = []
+        for n, leg in enumerate(loop["legs"], start=1):
+            lines.append(
+                f"{n}. **{leg['commodity']}** ×{leg['units']:,} — "
+                f"[{leg['origin_system']}] {leg['origin']} {auto_icon(leg['origin_auto'])} → "
+                f"[{leg['destination_system']}] {leg['destination']} {auto_icon(leg['destination_auto'])} "
+                f"• `{int(leg['profit']):,}` aUEC"
+            )
+        embed.add_field(
+            name=f"Loop {idx} — {len(loop['legs'])} legs • {int(loop['total']):,} aUEC",
+            value="\n".join(lines)[:1024],
+            inline=False
+        )
+
+    if ship_name:
+        embed.set_author(name=f"Ship: {ship_name} • {cargo_scu} SCU")
+    else:
+        embed.set_author(name=f"Cargo: {cargo_scu} SCU")
+
+    footer_bits = ["Star Citizen — UEX", "✅ Auto-load", "❌ No auto-load", "❔ Unknown"]
+    if auto_load_only:
+        footer_bits.append("Auto-load only")
+    if start_system:
+        footer_bits.append(f"Start: {start_system}")
+    embed.set_footer(text=" • ".join(footer_bits))
+    return embed
+
 async def build_trending_embed(limit: int = 10) -> discord.Embed:
     items = await get_trending_commodities(limit=limit)
 
@@ -3720,7 +5703,10 @@ async def build_trending_embed(limit: int = 10) -> discord.Embed:
         field_text += line + "\n\n"
 
     embed.add_field(name="Top Commodities", value=field_text.strip(), inline=False)
-    embed.set_footer(text="Star Citizen — UEX")
+    view = get_trade_view()
+    footer_bits = ["Star Citizen — UEX"]
+    set_data_as_of(embed, footer_bits, view["as_of"] if view else None)
+    embed.set_footer(text=" • ".join(footer_bits))
     return embed
 
 
@@ -3740,15 +5726,7 @@ async def build_cargo_embed(
     wanted_system = (system_filter or "").strip().lower()
 
     def is_terminal_auto_load(terminal_name: str) -> bool | None:
-        terminal_info = find_terminal_info(terminals, terminal_name)
-        if not terminal_info:
-            return None
-        val = terminal_info.get("is_auto_load")
-        if val in (1, "1", True):
-            return True
-        if val in (0, "0", False):
-            return False
-        return None
+        return terminal_auto_load(find_terminal_info(terminals, terminal_name))
 
     def terminal_matches_system(terminal_name: str) -> bool:
         if not wanted_system:
@@ -3779,7 +5757,7 @@ async def build_cargo_embed(
             if terminal_matches_system(r.get("terminal_name") or r.get("name_terminal") or "")
         ]
     
-    min_required_scu = cargo_scu * 0.75
+    min_required_scu = cargo_scu * CARGO_MIN_STOCK_RATIO
     
     sell_candidates = [
         r for r in rows
@@ -3799,7 +5777,7 @@ async def build_cargo_embed(
         embed.description = (
             f"Not enough buy/sell data to calculate cargo profit.\n"
             f"Locations must support at least `{min_required_scu:,.0f}` SCU "
-            f"(75% of your `{cargo_scu}` SCU ship)."
+            f"({CARGO_MIN_STOCK_RATIO:.0%} of your `{cargo_scu}` SCU ship)."
         )
         footer_bits = ["Star Citizen — UEX"]
         if auto_load_only:
@@ -4217,20 +6195,9 @@ class Last5DropdownView(discord.ui.View):
 
 async def fetch_and_display_last5(interaction, club_id, club_name="Club", original_message=None):
     club_id = str(club_id)
+    record_club_query(club_id)
 
-    match_types = ["leagueMatch", "playoffMatch", "friendlyMatch"]
-    matches = []
-
-    for match_type in match_types:
-        data = await _ea_get_json(
-            "https://proclubs.ea.com/api/fc/clubs/matches",
-            {"matchType": match_type, "platform": PLATFORM, "clubIds": club_id},
-        ) or []
-        for m in data:
-            m["_matchType"] = match_type  # keep track of type
-        matches.extend(data)
-
-    matches.sort(key=lambda x: x.get("timestamp", 0), reverse=True)
+    matches = await get_club_match_history(club_id)
     last_5 = matches[:5]
 
     if not last_5:
@@ -4953,23 +6920,14 @@ async def handle_lastmatch(interaction: discord.Interaction, club: str, from_dro
                 return
             club_id = str(valid_clubs[0]["clubInfo"]["clubId"]) if valid_clubs else club
 
-        # Pull matches
-        match_types = ["leagueMatch", "playoffMatch", "friendlyMatch"]
-        matches = []
-        for match_type in match_types:
-            data = await _ea_get_json(
-                "https://proclubs.ea.com/api/fc/clubs/matches",
-                {"matchType": match_type, "platform": PLATFORM, "clubIds": club_id},
-            ) or []
-            for m in data:
-                m["_matchType"] = match_type
-            matches.extend(data)
+        # Pull matches (newest first)
+        record_club_query(club_id)
+        matches = await get_club_match_history(club_id)
 
         if not matches:
             await interaction.followup.send("No matches found for this club.")
             return
 
-        matches.sort(key=lambda x: x.get("timestamp", 0), reverse=True)
         last_match = matches[0]
 
         raw_type = last_match.get("_matchType") or last_match.get("matchType")
@@ -5060,8 +7018,8 @@ class Top100View(discord.ui.View):
         self.per_page = per_page
         self.page = 0
         self.message = None
-        self.last_played_cache: dict[str, datetime | None] = {}
         self._busy = False
+        self._prefetch_task: asyncio.Task | None = None
 
 
     # ---------- helpers ----------
@@ -5083,30 +7041,40 @@ class Top100View(discord.ui.View):
         embed.set_footer(text="EA Pro Clubs All-Time Leaderboard")
         return embed
 
-    def get_page_slice(self):
-        start = self.page * self.per_page
+    def get_page_slice(self, page: int | None = None):
+        start = (self.page if page is None else page) * self.per_page
         end = start + self.per_page
         return self.data[start:end]
 
-    async def _ensure_last_played_for_page(self):
-        """Fetch last-played for visible clubs if not already cached."""
-        page_rows = self.get_page_slice()
+    async def _ensure_last_played_for_page(self, page: int | None = None):
+        """Fetch last-played for a page's clubs (batched) if not already in the shared cache."""
+        page_rows = self.get_page_slice(page)
         ids_needed = [
             str(club.get("clubId"))
             for club in page_rows
-            if str(club.get("clubId")) not in self.last_played_cache
+            if not has_cached_last_played(club.get("clubId"))
         ]
         if not ids_needed:
             return
 
-        sem = asyncio.Semaphore(5)
+        # results land in the shared last-played cache
+        await get_last_played_batch(ids_needed)
 
-        async def _job(cid: str):
-            async with sem:
-                dt = await get_last_played_timestamp(cid)
-                self.last_played_cache[cid] = dt
+    def _prefetch_next_page(self):
+        """Warm the next page's last-played data while the user reads this one."""
+        next_page = self.page + 1
+        if next_page * self.per_page >= len(self.data):
+            return
+        if self._prefetch_task and not self._prefetch_task.done():
+            return
+
+        async def _run():
+            try:
+                await self._ensure_last_played_for_page(next_page)
+            except Exception as e:
+                print(f"[WARN] /t100 prefetch failed: {e}")
 
-        await asyncio.gather(*[_job(cid) for cid in ids_needed])
+        self._prefetch_task = asyncio.create_task(_run())
 
     def _format_row(self, club: dict) -> str:
         # data extraction
@@ -5117,7 +7085,7 @@ class Top100View(discord.ui.View):
         cid = str(club.get("clubId", ""))
 
         # optional last played
-        lp = format_last_played(self.last_played_cache.get(cid))
+        lp = format_last_played(cached_last_played(cid))
         last_str = f" • Last Played: {lp}" if lp and lp != "—" else ""
 
         # two-line entry
@@ -5127,7 +7095,11 @@ class Top100View(discord.ui.View):
         return f"{line1}\n{line2}"
 
     async def get_embed(self):
+        if self._prefetch_task and not self._prefetch_task.done():
+            # usually the page we're about to show; don't request it twice
+            await asyncio.shield(self._prefetch_task)
         await self._ensure_last_played_for_page()
+        self._prefetch_next_page()
 
         page_rows = self.get_page_slice()
         description_lines = [self._format_row(c) for c in page_rows]
@@ -5227,16 +7199,11 @@ class Top100View(discord.ui.View):
 async def top100_command(interaction: discord.Interaction):
     await interaction.response.defer()
     try:
-        data = await _ea_get_json(
-            "https://proclubs.ea.com/api/fc/allTimeLeaderboard",
-            {"platform": PLATFORM},
-        )
-        if not isinstance(data, list):
+        top_100 = await get_leaderboard_top(100)
+        if not top_100:
             await interaction.followup.send("⚠️ No leaderboard data found.")
             return
 
-        top_100 = sorted(data, key=lambda c: c.get("rank", 9999))[:100]
-
         view = Top100View(top_100, per_page=10)
         embed = await view.get_embed()   # CHANGED: await
         message = await interaction.followup.send(embed=embed, view=view)
@@ -6500,6 +8467,27 @@ async def resetoffside_command(interaction: discord.Interaction):
     except Exception as e:
         await interaction.followup.send(f"⚠️ Failed to reset counter: {e}", ephemeral=True)
 
+@tree.command(name="eacache", description="Admin: show EA response cache hit/miss counters.")
+async def eacache_command(interaction: discord.Interaction):
+    member = interaction.user if isinstance(interaction.user, discord.Member) else interaction.guild.get_member(interaction.user.id)
+    if not has_admin_role(member):
+        await interaction.response.send_message("❌ Only **Administrators** can use /eacache.", ephemeral=True)
+        return
+
+    stats = get_ea_cache_stats()
+    lines = [
+        f"Entries: **{stats['size']}/{stats['max_entries']}**",
+        f"Circuit: **{'open' if stats['circuit_open'] else 'closed'}** • Retry budget: **{stats['retry_budget']}**",
+    ]
+    for endpoint, counts in sorted(stats["endpoints"].items()):
+        total = counts["hits"] + counts["stale"] + counts["misses"]
+        hit_rate = (counts["hits"] + counts["stale"]) / total * 100 if total else 0
+        lines.append(
+            f"`{endpoint}` — hits {counts['hits']} • stale {counts['stale']} • misses {counts['misses']} • {hit_rate:.0f}%"
+        )
+
+    await interaction.response.send_message("\n".join(lines)[:2000], ephemeral=True)
+
 @tree.command(name="commodity", description="Show Star Citizen commodity buy/sell data.")
 @app_commands.describe(
     name="Commodity name, e.g. Gold, Agricium, Quantanium",
@@ -6721,7 +8709,7 @@ async def terminal_command(interaction: discord.Interaction, name: str):
         terminal = matches[0]
         terminal_id = terminal.get("id")
 
-        data = await _uex_get("commodities_prices", params={"id_terminal": terminal_id})
+        data = await get_terminal_prices(terminal_id)
 
         if not data:
             await send_temp_followup(
@@ -6777,7 +8765,20 @@ async def besttrade_command(interaction: discord.Interaction):
     await interaction.response.defer()
 
     try:
-        routes = await _uex_get("commodities_routes", params={"limit": 20})
+        view = get_trade_view()
+
+        if view is not None:
+            routes = [
+                {
+                    "commodity_name": c["commodity"],
+                    "origin_terminal_name": c["origin"],
+                    "destination_terminal_name": c["destination"],
+                    "profit": int(c["profit"]),
+                }
+                for c in view["routes"][:10]
+            ]
+        else:
+            routes = await _uex_get("commodities_routes", params={"limit": 20})
 
         if not routes:
             msg = await send_temp_followup(
@@ -6806,6 +8807,11 @@ async def besttrade_command(interaction: discord.Interaction):
 
         embed.add_field(name="Top Routes", value="\n\n".join(lines), inline=False)
 
+        if view is not None:
+            footer_bits = ["Star Citizen — UEX"]
+            set_data_as_of(embed, footer_bits, view["as_of"])
+            embed.set_footer(text=" • ".join(footer_bits))
+
         msg = await send_temp_followup(interaction, embed=embed)
         await log_star_command_usage(interaction, "besttrade", message=msg)
 
@@ -7121,6 +9127,118 @@ async def bestnow_ship_autocomplete(
 ) -> list[app_commands.Choice[str]]:
     return await ship_autocomplete(interaction, current)
 
+@tree.command(name="tradeloop", description="Plan a multi-leg Star Citizen cargo loop.")
+@app_commands.describe(
+    ship="Ship name to take cargo capacity from",
+    scu="Manual cargo size in SCU if no ship is provided",
+    legs="Maximum number of legs in the loop (2-4)",
+    start_system="Star system the loop starts and ends in",
+    auto_load_only="Only use terminals that support auto loading"
+)
+@app_commands.choices(start_system=[
+    app_commands.Choice(name="Stanton", value="Stanton"),
+    app_commands.Choice(name="Pyro", value="Pyro"),
+    app_commands.Choice(name="Nyx", value="Nyx"),
+])
+async def tradeloop_command(
+    interaction: discord.Interaction,
+    ship: str = None,
+    scu: app_commands.Range[int, 1, 100000] = None,
+    legs: app_commands.Range[int, 2, 4] = 3,
+    start_system: app_commands.Choice[str] = None,
+    auto_load_only: bool = False
+):
+    await interaction.response.defer()
+
+    try:
+        selected_system = start_system.value if start_system else None
+        chosen_ship_name = None
+        resolved_scu = int(scu) if scu is not None else None
+
+        if ship:
+            ship_matches = await search_ships_scwiki(ship, cargo_only=True)
+
+            if not ship_matches:
+                await send_temp_followup(
+                    interaction,
+                    content="No matching ships found.",
+                    ephemeral=True
+                )
+                return
+
+            if len(ship_matches) > 1:
+                await send_temp_followup(
+                    interaction,
+                    content="Multiple ships found. Please choose the exact ship from autocomplete or type a more specific name.",
+                    ephemeral=True
+                )
+                return
+
+            chosen_ship = ship_matches[0]
+            resolved_scu = _ship_scu(chosen_ship)
+            chosen_ship_name = _ship_display_name(chosen_ship)
+
+            if resolved_scu <= 0:
+                await send_temp_followup(
+                    interaction,
+                    content="That ship does not have a usable cargo capacity in the API.",
+                    ephemeral=True
+                )
+                return
+
+        if not resolved_scu:
+            await send_temp_followup(
+                interaction,
+                content="Please provide a ship or a cargo size in SCU.",
+                ephemeral=True
+            )
+            return
+
+        try:
+            loops = await find_trade_loops(
+                resolved_scu,
+                max_legs=legs,
+                start_system=selected_system,
+                auto_load_only=auto_load_only
+            )
+        except asyncio.TimeoutError:
+            loops = []
+
+        if loops is None:
+            await send_temp_followup(
+                interaction,
+                content="Price data is still loading, please try again in a minute.",
+                ephemeral=True
+            )
+            return
+
+        embed = build_trade_loop_embed(
+            loops,
+            resolved_scu,
+            legs,
+            auto_load_only=auto_load_only,
+            start_system=selected_system,
+            ship_name=chosen_ship_name
+        )
+
+        msg = await send_temp_followup(interaction, embed=embed)
+        await log_star_command_usage(interaction, "tradeloop", message=msg)
+
+    except Exception as e:
+        print(f"[ERROR] /tradeloop failed: {e}")
+        await send_temp_followup(
+            interaction,
+            content="❌ An unexpected error occurred while planning trade loops.",
+            ephemeral=True
+        )
+
+@tradeloop_command.autocomplete("ship")
+async def tradeloop_ship_autocomplete(
+    interaction: discord.Interaction,
+    current: str
+) -> list[app_commands.Choice[str]]:
+    return await ship_autocomplete(interaction, current)
+
 @tree.command(name="members", description="Show current Star Citizen organisation members.")
 async def members_command(interaction: discord.Interaction):
     await interaction.response.defer()
@@ -7728,13 +9846,17 @@ async def on_ready():
             templates_store = await db_load_json(TEMPLATES_FILE, {})
             lineups_store = await db_load_json(LINEUPS_FILE, {"next_id": 1, "lineups": {}})
             print("🗄️ Loaded stores from Postgres.")
+            await load_last_played_store()
         except Exception as e:
             print(f"[ERROR] Postgres load failed: {e}")
     else:
         print("🗄️ Postgres skipped — using local JSON storage only.")
         # (Optional) raise here if persistence is required
         # raise
-        # --- command sync for multiple guilds ---
+
+    await load_catalog_snapshot()
+
+    # --- command sync for multiple guilds ---
     try:
         guild_ids = [
             int(x.strip())
@@ -7766,8 +9888,10 @@ async def on_ready():
         print(f"[ERROR] Command sync failed: {e}")
 
     print(f"Bot is ready as {client.user}")
+    await load_club_names_from_db()
     await warm_ea_session()
     asyncio.create_task(warm_scwiki_ship_cache())
+    asyncio.create_task(warm_uex_commodity_catalog())
     
     # Run background tasks once (avoid duplicates on reconnect)
     if not getattr(client, "background_started", False):
@@ -7782,6 +9906,40 @@ async def on_ready():
             print("📡 Twitch live monitor started.")
         except Exception as e:
             print(f"[ERROR] Could not start Twitch monitor: {e}")
+
+        try:
+            client.loop.create_task(leaderboard_refresh_loop())
+            print("🏆 Leaderboard snapshot refresh started.")
+        except Exception as e:
+            print(f"[ERROR] Could not start leaderboard refresh: {e}")
+
+        try:
+            client.loop.create_task(prewarm_loop())
+            print("🔥 Popular-club prewarm started.")
+        except Exception as e:
+            print(f"[ERROR] Could not start club prewarm: {e}")
+
+        try:
+            client.loop.create_task(last_played_persist_loop())
+        except Exception as e:
+            print(f"[ERROR] Could not start last-played persistence: {e}")
+
+        try:
+            client.loop.create_task(catalog_snapshot_loop())
+        except Exception as e:
+            print(f"[ERROR] Could not start catalog snapshot loop: {e}")
+
+        try:
+            client.loop.create_task(dataset_refresh_loop(_price_matrix_dataset, PRICE_MATRIX_TTL))
+            print("📊 Price matrix refresh started.")
+        except Exception as e:
+            print(f"[ERROR] Could not start price matrix refresh: {e}")
+
+        try:
+            client.loop.create_task(dataset_refresh_loop(_trade_view_dataset, TRADE_VIEW_REFRESH_SECONDS))
+            print("💰 Trade view refresh started.")
+        except Exception as e:
+            print(f"[ERROR] Could not start trade view refresh: {e}")
     
         client.background_started = True
 